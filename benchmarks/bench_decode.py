@@ -0,0 +1,67 @@
+"""Decode + resample benchmark: in-memory decode_audio vs the old temp-file path.
+
+The old path wrote the upload to temp_audio/, re-encoded non-WAV files to a
+second WAV through pydub and read it back with librosa.load. Needs ffmpeg.
+
+    python -m benchmarks.bench_decode
+"""
+import io
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import librosa
+from pydub import AudioSegment
+
+from pipeline.audio import decode_audio
+
+
+def synthetic_upload(fmt, seconds=60, sr=44100):
+    t = np.arange(int(seconds * sr)) / sr
+    y = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 0.5 * t))
+    pcm = (y * 32767).astype(np.int16)
+    segment = AudioSegment(pcm.tobytes(), frame_rate=sr, sample_width=2, channels=1)
+    buf = io.BytesIO()
+    segment.export(buf, format="ipod" if fmt == "m4a" else fmt)
+    return buf.getvalue()
+
+
+def legacy_decode(data, name, temp_dir):
+    file_path = os.path.join(temp_dir, name)
+    with open(file_path, "wb") as f:
+        f.write(data)
+    if not file_path.lower().endswith(".wav"):
+        audio = AudioSegment.from_file(file_path)
+        wav_path = os.path.splitext(file_path)[0] + ".wav"
+        audio.export(wav_path, format="wav")
+        file_path = wav_path
+    y, _ = librosa.load(file_path, sr=16000)
+    return y
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for fmt in ("wav", "mp3", "m4a"):
+            data = synthetic_upload(fmt)
+            name = f"upload.{fmt}"
+            legacy = best_of(lambda: legacy_decode(data, name, temp_dir))
+            in_memory = best_of(lambda: decode_audio(data))
+            print(f"{fmt:>4}: temp-file path {legacy * 1e3:8.1f} ms   in-memory {in_memory * 1e3:8.1f} ms   x{legacy / in_memory:5.1f}")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
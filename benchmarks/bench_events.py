@@ -0,0 +1,38 @@
+"""Microbenchmark: group_stutter_events vs extract_events.
+
+Run from the repo root:  python -m benchmarks.bench_events
+Equivalence is covered by tests/test_events.py.
+"""
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import random_probs
+from pipeline.events import group_stutter_events, extract_events
+
+
+def timeit(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for n_frames in (128, 1875, 18750):  # ~4s, 60s, 10min at 32 ms hops
+        probs = random_probs(rng, n_frames)
+        loop = timeit(lambda: group_stutter_events(probs))
+        vec = timeit(lambda: extract_events(probs))
+        print(f"{n_frames:>6} frames  loop {loop * 1e3:8.2f} ms  vectorized {vec * 1e3:8.2f} ms  x{loop / vec:6.1f}")
+
+    batch = np.stack([random_probs(rng, 1875) for _ in range(64)])
+    loop = timeit(lambda: [group_stutter_events(p) for p in batch], repeat=2)
+    vec = timeit(lambda: extract_events(batch), repeat=2)
+    print(f"batch 64x1875  loop {loop * 1e3:8.2f} ms  vectorized {vec * 1e3:8.2f} ms  x{loop / vec:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
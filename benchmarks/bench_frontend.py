@@ -0,0 +1,66 @@
+"""Parity and speed of the torch feature front end against preprocess_audio.
+
+    python -m benchmarks.bench_frontend
+"""
+import time
+
+import numpy as np
+import torch
+
+from pipeline.inference import preprocess_audio, compute_full_features, frame_windows
+from pipeline.frontend import TorchFeatureFrontend, pad_waveforms, FEATURE_ATOL
+
+SR = 16000
+
+
+def synthetic_waveforms(rng, count, min_seconds=2.0, max_seconds=8.0):
+    waveforms = []
+    for _ in range(count):
+        n = int(rng.uniform(min_seconds, max_seconds) * SR)
+        t = np.arange(n) / SR
+        f0 = rng.uniform(100, 300)
+        y = 0.3 * np.sin(2 * np.pi * f0 * t) + 0.05 * rng.standard_normal(n)
+        waveforms.append(y.astype(np.float32))
+    return waveforms
+
+
+def main():
+    rng = np.random.default_rng(0)
+    waveforms = synthetic_waveforms(rng, 32)
+    batch, lengths = pad_waveforms(waveforms)
+
+    clip_frontend = TorchFeatureFrontend()
+    full_frontend = TorchFeatureFrontend(max_len=None)
+    with torch.no_grad():
+        clip = clip_frontend(batch, lengths)
+        full, n_frames = full_frontend(batch, lengths)
+
+    clip_err = max((clip[i] - preprocess_audio(y)[0]).abs().max().item() for i, y in enumerate(waveforms))
+    full_db_err, full_err = 0.0, 0.0
+    for i, y in enumerate(waveforms):
+        torch_full = full[i, :, :, :n_frames[i]].numpy()
+        librosa_full = compute_full_features(y)
+        full_db_err = max(full_db_err, np.abs(torch_full - librosa_full).max())
+        # The model sees normalized windows, so that is where FEATURE_ATOL applies
+        full_err = max(full_err, np.abs(frame_windows(torch_full)[0] - frame_windows(librosa_full)[0]).max())
+    print(f"max abs error  clip features {clip_err:.2e}   full-length windows {full_err:.2e} "
+          f"(raw {full_db_err:.2e} dB)")
+    assert clip_err <= FEATURE_ATOL, clip_err
+    assert full_err <= FEATURE_ATOL, full_err
+
+    t0 = time.perf_counter()
+    for y in waveforms:
+        preprocess_audio(y)
+    librosa_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        clip_frontend(batch, lengths)
+    torch_time = time.perf_counter() - t0
+
+    print(f"{len(waveforms)} clips  librosa {librosa_time * 1e3:.1f} ms   torch batch {torch_time * 1e3:.1f} ms   "
+          f"x{librosa_time / torch_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Epoch time: per-sample librosa dataset vs memory-mapped shards.
+
+    python -m benchmarks.bench_loader labels.csv data/shards --workers 4
+
+"Before" recomputes mel/delta features with librosa for every window it
+serves (what a naive Dataset over audio files does). "After" reads the
+precomputed shards written by tools.build_shards. Both iterate one full
+epoch with the same batch size and worker count; --forward also runs the
+model so the numbers include compute.
+
+Before timing, one fastai training batch runs over the shard store
+(make_fastai_dataloaders + stutter_loss) as a smoke check of the training
+wiring; --skip-smoke turns it off.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from torch.utils.data import Dataset
+
+from model import CNN_BiGRU_StutterTiming, WINDOW_SIZE, BS, stutter_loss
+from pipeline.inference import load_full_features, frame_windows
+from pipeline.shards import (ShardedWindowDataset, frame_labels, window_labels, make_torch_loader,
+                             make_fastai_dataloaders)
+
+
+class OnTheFlyWindowDataset(Dataset):
+    def __init__(self, labels_csv):
+        labels = pd.read_csv(labels_csv)
+        base = os.path.dirname(os.path.abspath(labels_csv))
+        self.rows = []
+        for _, row in labels.iterrows():
+            path = row["file"] if os.path.isabs(row["file"]) else os.path.join(base, row["file"])
+            events = json.loads(row["events"]) if isinstance(row.get("events"), str) else []
+            n_windows = len(frame_windows(load_full_features(path))[1])
+            self.rows.extend((path, events, w) for w in range(n_windows))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, i):
+        path, events, w = self.rows[i]
+        features = load_full_features(path)
+        windows, starts = frame_windows(features)
+        seq, bins = window_labels(frame_labels(events, features.shape[-1]), starts)
+        return (torch.from_numpy(windows[w]), torch.tensor([bins[w]]),
+                torch.from_numpy(seq[w].astype(np.float32)))
+
+
+def epoch_time(dataset, workers, model=None):
+    loader = make_torch_loader(dataset, bs=BS, shuffle=True, num_workers=workers)
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        for x, _, _ in loader:
+            if model is not None:
+                model(x)
+    return time.perf_counter() - t0
+
+
+def fastai_smoke_check(shards):
+    """Train on a single batch through fastai's Learner; raises if the batch/loss wiring is wrong."""
+    from fastai.callback.core import Callback, CancelFitException
+    from fastai.learner import Learner
+
+    class StopAfterOneBatch(Callback):
+        def after_batch(self):
+            self.batch_loss = self.learn.loss.item()  # fit() clears learn.loss on exit
+            raise CancelFitException()
+
+    stop = StopAfterOneBatch()
+    dls = make_fastai_dataloaders(shards, bs=min(BS, 8), num_workers=0)
+    learn = Learner(dls, CNN_BiGRU_StutterTiming(sample_shape=(3, 64, WINDOW_SIZE)), loss_func=stutter_loss,
+                    cbs=stop)
+    with learn.no_logging():
+        learn.fit(1)
+    assert np.isfinite(stop.batch_loss), stop.batch_loss
+    return stop.batch_loss
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("labels")
+    parser.add_argument("shards")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--forward", action="store_true")
+    parser.add_argument("--skip-smoke", action="store_true", help="skip the one-batch fastai training check")
+    args = parser.parse_args(argv)
+
+    if not args.skip_smoke:
+        print(f"fastai one-batch smoke check: loss {fastai_smoke_check(args.shards):.4f}")
+
+    model = CNN_BiGRU_StutterTiming(sample_shape=(3, 64, WINDOW_SIZE)).eval() if args.forward else None
+    before_ds = OnTheFlyWindowDataset(args.labels)
+    after_ds = ShardedWindowDataset(args.shards)
+
+    before = epoch_time(before_ds, args.workers, model)
+    after = epoch_time(after_ds, args.workers, model)
+    print(f"on-the-fly librosa: {len(before_ds)} windows, epoch {before:.1f}s")
+    print(f"mmap shards:        {len(after_ds)} windows, epoch {after:.1f}s   x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Cold-start import cost of the login entry point.
+
+    python -m benchmarks.bench_startup
+
+Imports main_login in a fresh interpreter with ``-X importtime`` (Streamlit
+runs in bare mode, no DB connection is made before an email is entered),
+summarises the heaviest top-level packages and writes the report to
+benchmarks/results/startup-<timestamp>.json. Exits non-zero if any of the
+heavy inference packages are imported at login.
+"""
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+HEAVY_PACKAGES = ["torch", "librosa", "whisper", "fastai", "pandas", "matplotlib"]
+
+
+def run_importtime():
+    env = dict(os.environ)
+    for name, value in [("DB_USER", "bench"), ("DB_PASS", "bench"), ("DB_NAME", "bench")]:
+        env.setdefault(name, value)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main_login"],
+                          cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    return proc.returncode, proc.stderr
+
+
+def parse(stderr):
+    """Lines look like: 'import time:  self [us] | cumulative | imported package'."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), depth, int(cumulative_us)))
+    return modules
+
+
+def main():
+    returncode, stderr = run_importtime()
+    if returncode != 0:
+        print(stderr.strip().splitlines()[-1] if stderr.strip() else "import main_login failed")
+        sys.exit(returncode)
+    modules = parse(stderr)
+
+    # Entries directly under main_login carry the full cost of their subtree
+    total_us = next(us for name, depth, us in modules if depth == 0 and name == "main_login")
+    packages = defaultdict(int)
+    for name, depth, cumulative_us in modules:
+        if depth == 1:
+            packages[name.split(".")[0]] += cumulative_us
+    loaded = {name.split(".")[0] for name, _, _ in modules}
+    heavy = [p for p in HEAVY_PACKAGES if p in loaded]
+
+    print(f"import main_login: {total_us / 1e6:.2f}s across {len(modules)} modules")
+    for name, us in sorted(packages.items(), key=lambda kv: -kv[1])[:15]:
+        print(f"  {name:<28} {us / 1e3:9.1f} ms")
+    print("heavy packages at login:", ", ".join(heavy) if heavy else "none")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = os.path.join(RESULTS_DIR, "startup-" + datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "total_ms": total_us / 1e3,
+            "modules": len(modules),
+            "packages_ms": {k: v / 1e3 for k, v in sorted(packages.items(), key=lambda kv: -kv[1])},
+            "heavy_packages": heavy,
+        }, f, indent=2)
+    print(f"Wrote {output}")
+
+    if heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""End-to-end effect of the VAD pre-filter: skipped fraction and speedup.
+
+Each recording is run through the therapist_home pipeline twice (full-length
+features, windowed stutter inference, Whisper), once on the whole signal and
+once on the voiced regions only, and the wall times are compared.
+
+    python -m benchmarks.bench_vad sessions/*.wav          # your own sample set
+    python -m benchmarks.bench_vad --no-whisper            # synthetic sessions, stutter model only
+
+Without --model the stutter model is randomly initialised (timing only).
+Results are also written to benchmarks/results/vad_<timestamp>.json.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import torch
+
+from model import CNN_BiGRU_StutterTiming, WINDOW_SIZE
+from pipeline.audio import SAMPLE_RATE, decode_audio
+from pipeline.inference import compute_full_features, predict_windowed, load_model
+from pipeline.vad import apply_vad
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def synthetic_session(seconds=300, speech_ratio=0.4, seed=0):
+    """Tone bursts with syllable-rate modulation separated by low-level noise."""
+    rng = np.random.default_rng(seed)
+    y = (0.002 * rng.standard_normal(seconds * SAMPLE_RATE)).astype(np.float32)
+    t = 0.0
+    while t < seconds:
+        length = rng.uniform(1, 6)
+        if rng.random() < speech_ratio:
+            n = int(min(length, seconds - t) * SAMPLE_RATE)
+            start = int(t * SAMPLE_RATE)
+            tt = np.arange(n) / SAMPLE_RATE
+            burst = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 250) * tt) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * tt))
+            y[start:start + n] += burst.astype(np.float32)
+        t += length
+    return y
+
+
+def run_pipeline(y, model, whisper_model):
+    features = compute_full_features(y)
+    predict_windowed(model, features)
+    if whisper_model is not None:
+        whisper_model.transcribe(y)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="audio files (default: three synthetic 5-minute sessions)")
+    parser.add_argument("--model", default=None, help="stutter checkpoint (default: random weights)")
+    parser.add_argument("--no-whisper", action="store_true", help="leave Whisper out of the timed pipeline")
+    args = parser.parse_args(argv)
+
+    torch.manual_seed(0)
+    model = load_model(args.model) if args.model else CNN_BiGRU_StutterTiming(sample_shape=(3, 64, WINDOW_SIZE)).eval()
+    whisper_model = None
+    if not args.no_whisper:
+        import whisper
+        whisper_model = whisper.load_model("base")
+
+    if args.files:
+        samples = {}
+        for path in args.files:
+            with open(path, "rb") as f:
+                samples[os.path.basename(path)] = decode_audio(f.read())
+    else:
+        samples = {f"synthetic_{ratio:.0%}": synthetic_session(speech_ratio=ratio, seed=i)
+                   for i, ratio in enumerate((0.3, 0.5, 0.8))}
+
+    rows = []
+    for name, y in samples.items():
+        _, full_s = timed(lambda: run_pipeline(y, model, whisper_model))
+        (voiced, voiced_map), vad_s = timed(lambda: apply_vad(y))
+        _, voiced_s = timed(lambda: run_pipeline(voiced, model, whisper_model))
+        total_vad_s = vad_s + voiced_s
+        rows.append({
+            "name": name,
+            "seconds_audio": len(y) / SAMPLE_RATE,
+            "skipped_fraction": voiced_map.skipped_fraction,
+            "full_s": full_s,
+            "vad_s": vad_s,
+            "with_vad_s": total_vad_s,
+            "speedup": full_s / total_vad_s,
+        })
+        print(f"{name:>24}: {len(y) / SAMPLE_RATE:7.1f}s audio   skipped {voiced_map.skipped_fraction:5.1%}   "
+              f"full {full_s:7.2f}s   with VAD {total_vad_s:7.2f}s (vad {vad_s * 1e3:.0f} ms)   x{full_s / total_vad_s:4.2f}")
+
+    audio = sum(r["seconds_audio"] for r in rows)
+    skipped = sum(r["skipped_fraction"] * r["seconds_audio"] for r in rows) / audio
+    full = sum(r["full_s"] for r in rows)
+    with_vad = sum(r["with_vad_s"] for r in rows)
+    print(f"{'total':>24}: {audio:7.1f}s audio   skipped {skipped:5.1%}   "
+          f"full {full:7.2f}s   with VAD {with_vad:7.2f}s   x{full / with_vad:4.2f}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    out_path = os.path.join(RESULTS_DIR, f"vad_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(out_path, "w") as f:
+        json.dump({"whisper": whisper_model is not None, "recordings": rows,
+                   "skipped_fraction": skipped, "speedup": full / with_vad}, f, indent=2)
+    print(f"Wrote {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Benchmark suite for the audio, model and DB hot paths.
+
+    python -m benchmarks.suite                       # writes benchmarks/results/<timestamp>.json
+    python -m benchmarks.suite --compare old.json    # also prints the ratio against an earlier run
+
+Audio is synthetic (5 s, 60 s, 10 min). The model is a randomly initialised
+CNN_BiGRU_StutterTiming, so no checkpoint is needed. Events are grouped with
+extract_events / summarize_events, as the therapist page does. The DB
+statements are imported from the pages (therapist_calendar.USER_EVENTS_SQL,
+therapist_child_profiles.children_page_queries) and run against an in-memory
+SQLite stand-in for MySQL.
+"""
+import argparse
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import numpy as np
+import torch
+from sqlalchemy import create_engine, event, text
+
+from benchmarks.synthetic import random_probs
+from model import CNN_BiGRU_StutterTiming, WINDOW_SIZE
+from pipeline.inference import preprocess_audio, compute_full_features
+from pipeline.frames import FRAME_DURATION
+from pipeline.events import extract_events, summarize_events
+from pipeline.alignment import align_events
+from role_pages.therapist_calendar import USER_EVENTS_SQL
+from role_pages.therapist_child_profiles import children_page_queries
+
+SR = 16000
+DURATIONS = {"5s": 5, "60s": 60, "10min": 600}
+BATCH_SIZES = [1, 8, 32, 64]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# A padded month grid of one therapist's events, as load_user_events requests it
+USER_EVENTS = [(USER_EVENTS_SQL, {"email": "therapist7@example.com",
+                                  "range_start": "2023-02-16", "range_end": "2023-04-20"})]
+# First page of one therapist's children, unfiltered and searched; therapist_id is
+# resolved once per session, so its lookup is not part of a page render
+CHILD_LIST = children_page_queries(7, "", 0)
+CHILD_SEARCH = children_page_queries(7, "Child 7-1", 0)
+
+
+def measure(fn, repeat=5, warmup=1):
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"min_s": min(times), "median_s": float(np.median(times)), "repeat": repeat}
+
+
+def synthetic_audio(seconds, rng):
+    t = np.arange(int(seconds * SR)) / SR
+    y = 0.3 * np.sin(2 * np.pi * 180 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    return (y + 0.02 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def synthetic_segments(seconds):
+    return [{"start": float(s), "end": float(s) + 2.5, "text": f"segment {i}"}
+            for i, s in enumerate(np.arange(0, seconds, 3.0))]
+
+
+def bench_audio(results, rng):
+    for name, seconds in DURATIONS.items():
+        y = synthetic_audio(seconds, rng)
+        repeat = 5 if seconds <= 60 else 2
+        results[f"preprocess_audio/{name}"] = measure(lambda: preprocess_audio(y), repeat)
+        results[f"compute_full_features/{name}"] = measure(lambda: compute_full_features(y), repeat)
+
+
+def bench_model(results):
+    model = CNN_BiGRU_StutterTiming(sample_shape=(3, 64, WINDOW_SIZE)).eval()
+    with torch.no_grad():
+        for batch in BATCH_SIZES:
+            x = torch.randn(batch, 3, 64, WINDOW_SIZE)
+            r = measure(lambda: model(x), repeat=10)
+            r["windows_per_sec"] = batch / r["median_s"]
+            results[f"forward/batch{batch}"] = r
+
+
+def bench_events(results, rng):
+    for name, seconds in DURATIONS.items():
+        n_frames = int(seconds / FRAME_DURATION) + 1
+        probs = random_probs(rng, n_frames)
+        results[f"extract_events/{name}"] = measure(lambda: summarize_events(extract_events(probs)))
+
+        events, _ = summarize_events(extract_events(probs))
+        segments = synthetic_segments(seconds)
+        r = measure(lambda: align_events(events, segments), repeat=3)
+        r.update(events=len(events), segments=len(segments))
+        results[f"align_events/{name}"] = r
+
+
+def build_db(n_users=50, children_per_user=40, events_per_user=2000):
+    engine = create_engine("sqlite://")
+
+    # MySQL's TIMESTAMP(date, time), so the calendar query runs unchanged
+    @event.listens_for(engine, "connect")
+    def add_timestamp(dbapi_conn, _):
+        dbapi_conn.create_function("TIMESTAMP", 2, lambda d, t: f"{d} {t}", deterministic=True)
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE user_list (user_id INTEGER PRIMARY KEY, email TEXT, password TEXT, role TEXT)"))
+        conn.execute(text("""CREATE TABLE child_list (child_id INTEGER PRIMARY KEY, therapist_id INTEGER,
+                             recent_visit_date TEXT, full_name TEXT, parent_email TEXT, age INTEGER, place TEXT)"""))
+        conn.execute(text("""CREATE TABLE event_list (event_id INTEGER PRIMARY KEY, event_name TEXT, event_date TEXT,
+                             event_from_time TEXT, event_to_time TEXT, user_id INTEGER, child_id INTEGER)"""))
+        conn.execute(text("INSERT INTO user_list (user_id, email, password, role) VALUES (:id, :e, 'x', 'Therapist')"),
+                     [{"id": u, "e": f"therapist{u}@example.com"} for u in range(1, n_users + 1)])
+        conn.execute(text("""INSERT INTO child_list (therapist_id, recent_visit_date, full_name, parent_email, age, place)
+                             VALUES (:t, :d, :n, 'parent@example.com', 7, 'Clinic')"""),
+                     [{"t": u, "d": f"2025-{1 + c % 12:02d}-{1 + c % 28:02d} 10:00:00", "n": f"Child {u}-{c}"}
+                      for u in range(1, n_users + 1) for c in range(children_per_user)])
+        conn.execute(text("""INSERT INTO event_list (event_name, event_date, event_from_time, event_to_time, user_id, child_id)
+                             VALUES ('Session', :d, '10:00:00', '11:00:00', :u, 1)"""),
+                     [{"u": u, "d": f"{2020 + e // 365}-{1 + e % 12:02d}-{1 + e % 28:02d}"}
+                      for u in range(1, n_users + 1) for e in range(events_per_user)])
+    return engine
+
+
+def bench_db(results):
+    engine = build_db()
+
+    def run(statements):
+        with engine.connect() as conn:
+            for sql, params in statements:
+                conn.execute(text(sql), params).fetchall()
+
+    results["db/load_user_events"] = measure(lambda: run(USER_EVENTS), repeat=20)
+    results["db/child_profiles"] = measure(lambda: run(CHILD_LIST), repeat=20)
+    results["db/child_profiles_search"] = measure(lambda: run(CHILD_SEARCH), repeat=20)
+
+
+def compare(current, previous_path):
+    with open(previous_path) as f:
+        previous = json.load(f)["results"]
+    print(f"\n{'benchmark':<34} {'before':>10} {'after':>10} {'ratio':>7}")
+    for name, r in current.items():
+        if name in previous:
+            before, after = previous[name]["median_s"], r["median_s"]
+            print(f"{name:<34} {before * 1e3:>8.2f}ms {after * 1e3:>8.2f}ms {after / before:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", default=None, help="results JSON (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to diff against")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["audio", "model", "events", "db"])
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    results = {}
+    for group, fn in [("audio", lambda: bench_audio(results, rng)), ("model", lambda: bench_model(results)),
+                      ("events", lambda: bench_events(results, rng)), ("db", lambda: bench_db(results))]:
+        if group not in args.skip:
+            fn()
+
+    for name, r in results.items():
+        print(f"{name:<34} median {r['median_s'] * 1e3:10.2f} ms")
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+            "results": results,
+        }, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
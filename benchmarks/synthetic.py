@@ -0,0 +1,12 @@
+"""Synthetic inputs shared by the benchmarks and tests/test_events.py."""
+import numpy as np
+
+from pipeline.events import TYPE_NAMES
+
+
+def random_probs(rng, n_frames):
+    # Smoothed noise so runs of active frames look like real model output
+    noise = rng.random((n_frames + 8, len(TYPE_NAMES)))
+    kernel = np.ones(9) / 9
+    smooth = np.stack([np.convolve(noise[:, i], kernel, mode="valid") for i in range(noise.shape[1])], axis=1)
+    return (smooth - smooth.min()) / (smooth.max() - smooth.min())
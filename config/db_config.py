@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+import urllib.parse
+from collections import deque
+
+import streamlit as st
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+load_dotenv()
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # below MySQL's default wait_timeout
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits = deque(maxlen=1000)
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        conn = super()._do_get()
+        wait = time.perf_counter() - t0
+        with self._stats_lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.recent_waits.append(wait)
+        return conn
+
+
+def database_url():
+    db_user = os.getenv("DB_USER")
+    db_pass = urllib.parse.quote(os.getenv("DB_PASS"))
+    db_name = os.getenv("DB_NAME")
+    db_host = os.getenv("DB_HOST", "localhost")
+    return f"mysql+pymysql://{db_user}:{db_pass}@{db_host}/{db_name}"
+
+
+# 🔹 One engine per process, shared by every page and kept across Streamlit reruns
+@st.cache_resource
+def get_engine():
+    return create_engine(
+        database_url(),
+        poolclass=TimedQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+
+# 🔹 Search text is matched literally: % and _ are wildcards in LIKE (use with ESCAPE '\\')
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def pool_stats():
+    pool = get_engine().pool
+    waits = sorted(pool.recent_waits)
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": pool.checkouts,
+        "avg_wait_ms": pool.total_wait / pool.checkouts * 1e3 if pool.checkouts else 0.0,
+        "p95_wait_ms": waits[int(0.95 * (len(waits) - 1))] * 1e3 if waits else 0.0,
+        "max_wait_ms": pool.max_wait * 1e3,
+    }
@@ -0,0 +1,65 @@
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+HIDDEN_SIZE = 256
+RNN_LAYERS = 2
+LOSS_BIN_WEIGHT = 0.2  # ADJUSTED: Decreased from 0.3
+LOSS_SEQ_WEIGHT = 0.8  # ADJUSTED: Increased from 0.7
+MAX_LEN = 128
+WINDOW_SIZE = 64
+HOP_SIZE = 16          # ADJUSTED: Decreased from 32 (Increased overlap)
+BS = 32
+class CNN_BiGRU_StutterTiming(nn.Module):
+    def __init__(self, n_types=5, hidden_size=HIDDEN_SIZE, rnn_layers=RNN_LAYERS, sample_shape=(3, WINDOW_SIZE, WINDOW_SIZE)):
+        super().__init__()
+        self.cnn = nn.Sequential(
+            # Block 1: 3 -> 16
+            nn.Conv2d(3, 16, 3, padding=1), nn.ReLU(), nn.BatchNorm2d(16),
+            nn.MaxPool2d((2,1)),
+            nn.Dropout(0.3), # ADJUSTED: Increased dropout from 0.2 to 0.3
+
+            # Block 2: 16 -> 32
+            nn.Conv2d(16, 32, 3, padding=1), nn.ReLU(), nn.BatchNorm2d(32),
+            nn.MaxPool2d((2,1)),
+            nn.Dropout(0.3), # ADJUSTED: Increased dropout from 0.2 to 0.3
+
+            # Block 3: 32 -> 64
+            nn.Conv2d(32, 64, 3, padding=1), nn.ReLU(), nn.BatchNorm2d(64),
+            nn.MaxPool2d((2,1)),
+            nn.Dropout(0.3), # ADJUSTED: Increased dropout from 0.2 to 0.3
+            
+            # Block 4: 64 -> 128
+            nn.Conv2d(64, 128, 3, padding=1), nn.ReLU(), nn.BatchNorm2d(128),
+            nn.AdaptiveAvgPool2d((1, None))
+        )
+
+        with torch.no_grad():
+            dummy = torch.zeros(1, *sample_shape)
+            cnn_out = self.cnn(dummy).squeeze(2)
+            cnn_features = cnn_out.shape[1]
+
+        self.rnn_seq = nn.GRU(input_size=cnn_features, hidden_size=hidden_size,
+                              num_layers=rnn_layers,
+                              batch_first=True, dropout=0.5, bidirectional=True) # ADJUSTED: Increased dropout from 0.3 to 0.5
+        
+        self.layer_norm = nn.LayerNorm(hidden_size * 2)
+        self.fc_bin = nn.Linear(hidden_size * 2, 1)
+        self.fc_seq = nn.Linear(hidden_size * 2, n_types)
+
+    def forward(self, x):
+        cnn_out = self.cnn(x).squeeze(2)
+        x_seq = cnn_out.permute(0, 2, 1) # (B, Time, Features)
+        out, _ = self.rnn_seq(x_seq)     # out shape: (B, Time, 2*Hidden)
+        out = self.layer_norm(out)
+        
+        bin_out = self.fc_bin(out[:, -1])
+        seq_out = self.fc_seq(out) # (B, Time, n_types)
+        
+        return bin_out, seq_out
+
+def stutter_loss(preds, bin_target, seq_target):
+    bin_out, seq_out = preds
+    bin_loss = F.binary_cross_entropy_with_logits(bin_out, bin_target)
+    seq_loss = F.binary_cross_entropy_with_logits(seq_out, seq_target)
+    return LOSS_BIN_WEIGHT * bin_loss + LOSS_SEQ_WEIGHT * seq_loss
@@ -0,0 +1,67 @@
+"""Align stutter events with Whisper segments (and word timestamps when present).
+
+Intervals are matched by overlap, not containment: a segment or word belongs
+to an event when it starts before the event ends and ends after it starts.
+Segments are sorted once and each event is resolved with two binary searches
+(on start times and on the running maximum of end times), so the cost is
+O((events + segments) log segments + matches) instead of events × segments.
+"""
+import bisect
+
+import numpy as np
+import pandas as pd
+
+ALIGNMENT_COLUMNS = ["type", "start", "end", "segment_ids", "text", "words", "overlap_s"]
+
+
+class IntervalIndex:
+    def __init__(self, intervals):
+        """intervals: iterable of (start, end, payload)."""
+        items = sorted(intervals, key=lambda it: (it[0], it[1]))
+        self.starts = [it[0] for it in items]
+        self.ends = [it[1] for it in items]
+        self.payloads = [it[2] for it in items]
+        # Running max of end times is monotonic even when intervals overlap each other
+        self._max_ends = np.maximum.accumulate(self.ends).tolist() if items else []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlapping(self, start, end):
+        lo = bisect.bisect_right(self._max_ends, start)
+        hi = bisect.bisect_left(self.starts, end)
+        return [(self.starts[i], self.ends[i], self.payloads[i])
+                for i in range(lo, hi) if self.ends[i] > start]
+
+
+def segment_index(segments):
+    return IntervalIndex((seg["start"], seg["end"], (i, seg)) for i, seg in enumerate(segments))
+
+
+def word_index(segments):
+    return IntervalIndex(
+        (w["start"], w["end"], w["word"].strip())
+        for seg in segments for w in seg.get("words", []) or []
+    )
+
+
+def align_events(events, segments):
+    """events: (type, start, end) tuples → one row per event with its overlapping
+    segment ids and text, overlapping words (if Whisper returned word timestamps)
+    and the total seconds of segment overlap."""
+    segs = segment_index(segments)
+    words = word_index(segments)
+
+    rows = []
+    for st_type, start, end in events:
+        matches = segs.overlapping(start, end)
+        rows.append({
+            "type": st_type,
+            "start": start,
+            "end": end,
+            "segment_ids": [i for _, _, (i, _) in matches],
+            "text": " ".join(seg["text"].strip() for _, _, (_, seg) in matches),
+            "words": " ".join(w for _, _, w in words.overlapping(start, end)) if len(words) else "",
+            "overlap_s": round(sum(min(end, s_end) - max(start, s_start) for s_start, s_end, _ in matches), 2),
+        })
+    return pd.DataFrame(rows, columns=ALIGNMENT_COLUMNS)
@@ -0,0 +1,39 @@
+import io
+import subprocess
+
+import numpy as np
+import librosa
+import soundfile as sf
+
+from pipeline.frames import SAMPLE_RATE
+
+
+# 🔹 Decode with ffmpeg straight from memory: one pass for decode, downmix and resample
+def _ffmpeg_decode(data, sr):
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(sr),
+        "pipe:1",
+    ]
+    try:
+        proc = subprocess.run(cmd, input=data, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='ignore').strip()}") from e
+    return np.frombuffer(proc.stdout, dtype=np.float32).copy()
+
+
+# 🔹 Uploaded bytes → 16 kHz mono float32 array (no temp files)
+def decode_audio(data, sr=SAMPLE_RATE):
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    try:
+        # WAV/FLAC/OGG: libsndfile reads from the buffer without a subprocess
+        y, file_sr = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    except (sf.LibsndfileError, RuntimeError):
+        return _ffmpeg_decode(data, sr)
+
+    y = y.mean(axis=1)
+    if file_sr != sr:
+        y = librosa.resample(y, orig_sr=file_sr, target_sr=sr)
+    return np.ascontiguousarray(y, dtype=np.float32)
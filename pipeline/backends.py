@@ -0,0 +1,98 @@
+import copy
+import os
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from pipeline.frames import N_MELS
+from pipeline.inference import load_model, MODEL_PATH
+
+TORCHSCRIPT_PATH = "stutter_model_full.ts.pt"
+ONNX_PATH = "stutter_model_full.onnx"
+BACKENDS = ("torch", "torchscript", "onnx")
+
+
+# 🔹 Every backend is called like the eager module: x (B, 3, n_mels, T) → (bin_out, seq_out) tensors
+class TorchScriptBackend:
+    def __init__(self, path=TORCHSCRIPT_PATH):
+        self.module = torch.jit.load(path, map_location="cpu")
+        self.module.eval()
+
+    def __call__(self, x):
+        return self.module(x)
+
+
+class OnnxBackend:
+    def __init__(self, path=ONNX_PATH, intra_op_threads=0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, x):
+        x = x.detach().cpu().numpy() if isinstance(x, torch.Tensor) else np.asarray(x, dtype=np.float32)
+        bin_out, seq_out = self.session.run(["bin_out", "seq_out"], {self.input_name: x})
+        return torch.from_numpy(bin_out), torch.from_numpy(seq_out)
+
+
+# 🔹 Export an eager model for a backend: dynamic batch and time axes, same (bin_out, seq_out) outputs
+def export_torchscript(model, path):
+    # Traced rather than scripted: AdaptiveAvgPool2d((1, None)) does not script, and the
+    # forward pass has no data-dependent control flow, so the trace keeps batch and time dynamic
+    with torch.no_grad():
+        traced = torch.jit.trace(model.eval(), torch.randn(2, 3, N_MELS, 64))
+    traced.save(path)
+
+
+class _FreqMean(nn.Module):
+    """AdaptiveAvgPool2d((1, None)) as a plain mean over the frequency axis (same values)."""
+
+    def forward(self, x):
+        return x.mean(dim=2, keepdim=True)
+
+
+def export_onnx(model, path, opset=17):
+    # The TorchScript-based exporter honours dynamic_axes; the dynamo one specializes the GRU's
+    # sequence length to the dummy's 64 frames. It cannot export the (1, None) adaptive pool,
+    # so that layer is swapped for the equivalent mean on a copy of the model.
+    model = copy.deepcopy(model).eval()
+    for name, module in model.named_modules():
+        if isinstance(module, nn.AdaptiveAvgPool2d) and tuple(module.output_size) == (1, None):
+            parent, _, attr = name.rpartition(".")
+            setattr(model.get_submodule(parent), attr, _FreqMean())
+    dummy = torch.randn(2, 3, N_MELS, 64)
+    torch.onnx.export(
+        model, dummy, path,
+        input_names=["input"],
+        output_names=["bin_out", "seq_out"],
+        dynamic_axes={
+            "input": {0: "batch", 3: "time"},
+            "bin_out": {0: "batch"},
+            "seq_out": {0: "batch", 1: "time"},
+        },
+        opset_version=opset,
+        dynamo=False,
+    )
+
+
+EXPORTERS = {"torchscript": export_torchscript, "onnx": export_onnx}
+
+
+def backend_kind(kind=None):
+    kind = kind or os.getenv("INFERENCE_BACKEND", "torch")
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {kind!r}; expected one of {BACKENDS}")
+    return kind
+
+
+# 🔹 Pick an inference engine by name (defaults to $INFERENCE_BACKEND, then eager PyTorch)
+def load_backend(kind=None, path=None):
+    kind = backend_kind(kind)
+    if kind == "torch":
+        return load_model(path or MODEL_PATH)
+    if kind == "torchscript":
+        return TorchScriptBackend(path or TORCHSCRIPT_PATH)
+    return OnnxBackend(path or ONNX_PATH)
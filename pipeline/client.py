@@ -0,0 +1,34 @@
+import json
+import os
+import urllib.request
+
+import numpy as np
+
+DEFAULT_TIMEOUT = 600
+
+
+# 🔹 Base URL of pipeline.server, e.g. http://127.0.0.1:8765 (unset = run models in-process)
+def server_url():
+    return os.getenv("INFERENCE_SERVER_URL")
+
+
+def _post(path, audio_bytes, timeout=DEFAULT_TIMEOUT):
+    request = urllib.request.Request(
+        server_url().rstrip("/") + path,
+        data=audio_bytes,
+        headers={"Content-Type": "application/octet-stream"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def detect(audio_bytes, full_length=True):
+    result = _post(f"/detect?full_length={int(full_length)}", audio_bytes)
+    stats = result["stats"] if full_length else {"model_version": result["stats"].get("model_version")}
+    return result["bin_prob"], np.asarray(result["seq_probs"], dtype=np.float32), stats
+
+
+def transcribe(audio_bytes):
+    result = _post("/transcribe", audio_bytes)
+    return result["text"], result["segments"]
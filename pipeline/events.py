@@ -0,0 +1,119 @@
+import numpy as np
+
+from pipeline.frames import FRAME_DURATION
+
+THRESHOLD = 0.5
+TYPE_NAMES = ["Prolongation", "Block", "SoundRep", "WordRep", "Interjection"]
+
+# seq: index into the batch, type: index into TYPE_NAMES, start/end in seconds
+EVENT_DTYPE = np.dtype([
+    ("seq", np.int32),
+    ("type", np.int8),
+    ("start", np.float64),
+    ("end", np.float64),
+    ("peak", np.float32),
+])
+
+# 🔹 Group stutter events (reference per-frame implementation)
+def group_stutter_events(seq_probs, threshold=THRESHOLD, frame_duration=FRAME_DURATION):
+    seq_probs = seq_probs.T
+    events = []
+    type_counts = [0] * len(TYPE_NAMES)
+
+    for type_idx, st_type in enumerate(TYPE_NAMES):
+        active = False
+        start_frame = None
+        for t in range(seq_probs.shape[1]):
+            prob = seq_probs[type_idx, t]
+            if prob > threshold:
+                if not active:
+                    active = True
+                    start_frame = t
+            else:
+                if active:
+                    end_frame = t
+                    start = round(start_frame * frame_duration, 2)
+                    end = round(end_frame * frame_duration, 2)
+                    events.append((st_type, start, end))
+                    type_counts[type_idx] += 1
+                    active = False
+        if active:
+            end_frame = seq_probs.shape[1]
+            start = round(start_frame * frame_duration, 2)
+            end = round(end_frame * frame_duration, 2)
+            events.append((st_type, start, end))
+            type_counts[type_idx] += 1
+
+    return events, dict(zip(TYPE_NAMES, type_counts))
+
+# 🔹 Vectorized run-length event extraction
+def extract_events(seq_probs, threshold=THRESHOLD, frame_duration=FRAME_DURATION,
+                   min_duration=0.0, merge_gap=0.0):
+    """seq_probs is (T, n_types) or a batch (B, T, n_types).
+
+    threshold may be a scalar or one value per type. Events closer than
+    merge_gap seconds are merged, then events shorter than min_duration
+    seconds are dropped. Returns a structured array of EVENT_DTYPE ordered
+    by sequence, type and start time.
+    """
+    probs = np.asarray(seq_probs, dtype=np.float32)
+    if probs.ndim == 2:
+        probs = probs[None]
+    n_seq, n_frames, n_types = probs.shape
+    thresholds = np.broadcast_to(np.asarray(threshold, dtype=np.float32), (n_types,))
+
+    # (B * n_types, T + 1) rows, padded with one inactive frame so every run closes
+    rows = np.full((n_seq, n_types, n_frames + 1), -np.inf, dtype=np.float32)
+    rows[:, :, :n_frames] = probs.transpose(0, 2, 1)
+    rows = rows.reshape(n_seq * n_types, n_frames + 1)
+    active = rows > np.tile(thresholds, n_seq)[:, None]
+
+    edges = np.diff(active.astype(np.int8), axis=1, prepend=0)
+    onsets = np.flatnonzero(edges == 1)
+    offsets = np.flatnonzero(edges == -1)
+    width = n_frames + 1
+    row_idx = onsets // width
+    on = onsets % width
+    off = offsets % width
+
+    if merge_gap > 0 and len(on) > 1:
+        gap_frames = merge_gap / frame_duration
+        joined = (row_idx[1:] == row_idx[:-1]) & (on[1:] - off[:-1] <= gap_frames)
+        first = np.concatenate([[True], ~joined])
+        last = np.concatenate([~joined, [True]])
+        row_idx, on, off = row_idx[first], on[first], off[last]
+
+    if min_duration > 0:
+        keep = (off - on) * frame_duration >= min_duration
+        row_idx, on, off = row_idx[keep], on[keep], off[keep]
+
+    events = np.empty(len(on), dtype=EVENT_DTYPE)
+    events["seq"] = row_idx // n_types
+    events["type"] = row_idx % n_types
+    events["start"] = np.round(on * frame_duration, 2)
+    events["end"] = np.round(off * frame_duration, 2)
+    if len(on):
+        bounds = np.empty(2 * len(on), dtype=np.int64)
+        bounds[0::2] = row_idx * width + on
+        bounds[1::2] = row_idx * width + off
+        events["peak"] = np.maximum.reduceat(rows.ravel(), bounds)[0::2]
+    return events
+
+# 🔹 Convert one sequence's structured events to the (events, type_counts) UI format
+def summarize_events(events, seq=0):
+    events = events[events["seq"] == seq]
+    counts = np.bincount(events["type"], minlength=len(TYPE_NAMES))
+    listed = [(TYPE_NAMES[t], float(s), float(e)) for t, s, e in zip(events["type"], events["start"], events["end"])]
+    return listed, dict(zip(TYPE_NAMES, counts.tolist()))
+
+# 🔹 Per-type counts of (type, start, end) rows, e.g. after VAD remapping split some of them
+def count_types(events):
+    counts = dict.fromkeys(TYPE_NAMES, 0)
+    for t, _, _ in events:
+        counts[t] += 1
+    return counts
+
+# 🔹 Transcript segments fully contained in each event
+def match_segments(events, segments):
+    return [[seg["text"] for seg in segments if seg["start"] >= start and seg["end"] <= end]
+            for _, start, end in events]
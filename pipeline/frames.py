@@ -0,0 +1,13 @@
+"""Time base shared by feature extraction, the model's per-frame output and event timestamps.
+
+Each mel/delta column, and so each seq_out frame, is one librosa hop:
+HOP_LENGTH / SAMPLE_RATE seconds (32 ms).
+"""
+SAMPLE_RATE = 16000
+N_MELS = 64
+HOP_LENGTH = 512
+FRAME_DURATION = HOP_LENGTH / SAMPLE_RATE
+
+
+def frame_duration(sr=SAMPLE_RATE, hop_length=HOP_LENGTH):
+    return hop_length / sr
@@ -0,0 +1,124 @@
+"""Torch feature front end: mel → dB → delta → delta2 → normalization on a padded batch.
+
+Matches pipeline.inference.preprocess_audio (max_len set) and
+compute_full_features (max_len=None) on 16 kHz input. On float32 CPU the
+normalized features agree to within 1e-3 max absolute difference (typically
+~1e-5); FEATURE_ATOL is the bound benchmarks/bench_frontend.py checks against.
+"""
+import numpy as np
+import librosa
+import scipy.signal
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from pipeline.frames import SAMPLE_RATE, N_MELS, HOP_LENGTH
+
+FEATURE_ATOL = 1e-3
+DELTA_WIDTH = 9
+
+
+def pad_waveforms(waveforms):
+    """List of 1-D arrays → zero-padded (B, N) float32 tensor and sample lengths."""
+    lengths = torch.tensor([len(y) for y in waveforms], dtype=torch.long)
+    batch = torch.zeros(len(waveforms), int(lengths.max()))
+    for i, y in enumerate(waveforms):
+        batch[i, :len(y)] = torch.as_tensor(np.asarray(y, dtype=np.float32))
+    return batch, lengths
+
+
+class TorchFeatureFrontend(nn.Module):
+    def __init__(self, sr=SAMPLE_RATE, n_mels=N_MELS, n_fft=2048, hop_length=HOP_LENGTH, max_len=128,
+                 amin=1e-10, top_db=80.0):
+        super().__init__()
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.max_len = max_len
+        self.amin = amin
+        self.top_db = top_db
+
+        self.register_buffer("mel_basis", torch.from_numpy(librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)))
+        self.register_buffer("window", torch.hann_window(n_fft))
+
+        # librosa.feature.delta is a Savitzky-Golay filter with mode="interp":
+        # a sliding dot product inside, a polynomial fit over the first/last window at the edges.
+        half = DELTA_WIDTH // 2
+        for order in (1, 2):
+            kernel = scipy.signal.savgol_coeffs(DELTA_WIDTH, order, deriv=order, use="dot")
+            edges = scipy.signal.savgol_filter(np.eye(DELTA_WIDTH), DELTA_WIDTH, order, deriv=order,
+                                               mode="interp", axis=-1)
+            self.register_buffer(f"delta{order}_kernel", torch.tensor(kernel, dtype=torch.float32).view(1, 1, -1))
+            self.register_buffer(f"delta{order}_head", torch.tensor(edges[:, :half], dtype=torch.float32))
+            self.register_buffer(f"delta{order}_tail", torch.tensor(edges[:, -half:], dtype=torch.float32))
+
+    def _power_to_db(self, S, valid):
+        log_spec = 10.0 * torch.log10(S.clamp(min=self.amin))
+        ref = S.masked_fill(~valid[:, None, :], 0).amax(dim=(1, 2))
+        log_spec = log_spec - 10.0 * torch.log10(ref.clamp(min=self.amin))[:, None, None]
+        peak = log_spec.masked_fill(~valid[:, None, :], -float("inf")).amax(dim=(1, 2))
+        return torch.maximum(log_spec, (peak - self.top_db)[:, None, None])
+
+    def _delta(self, x, order, n_frames):
+        B, n_mels, T = x.shape
+        if int(n_frames.min()) < DELTA_WIDTH:
+            raise ValueError(f"Need at least {DELTA_WIDTH} frames to compute deltas")
+        half = DELTA_WIDTH // 2
+        kernel = getattr(self, f"delta{order}_kernel")
+        head = getattr(self, f"delta{order}_head")
+        tail = getattr(self, f"delta{order}_tail")
+
+        out = F.conv1d(x.reshape(B * n_mels, 1, T), kernel, padding=half).view(B, n_mels, T)
+        out[..., :half] = x[..., :DELTA_WIDTH] @ head
+
+        # Each sequence ends at its own frame count
+        offsets = torch.arange(DELTA_WIDTH, device=x.device)
+        idx = (n_frames[:, None] - DELTA_WIDTH + offsets)[:, None, :].expand(B, n_mels, DELTA_WIDTH)
+        tail_idx = idx[..., -half:]
+        out.scatter_(2, tail_idx, torch.gather(x, 2, idx) @ tail)
+        return out
+
+    def forward(self, waveforms, lengths=None):
+        """waveforms (B, N) at 16 kHz → (B, 3, n_mels, max_len), or with max_len=None
+        (B, 3, n_mels, T) un-normalized plus per-sequence frame counts."""
+        B, N = waveforms.shape
+        if lengths is None:
+            lengths = torch.full((B,), N, dtype=torch.long, device=waveforms.device)
+
+        spec = torch.stft(waveforms, self.n_fft, hop_length=self.hop_length, window=self.window,
+                          center=True, pad_mode="constant", return_complex=True)
+        S = torch.matmul(self.mel_basis, spec.abs() ** 2)  # (B, n_mels, T)
+        T = S.shape[-1]
+        n_frames = (1 + lengths // self.hop_length).clamp(max=T)
+        valid = torch.arange(T, device=S.device)[None, :] < n_frames[:, None]
+
+        S_db = self._power_to_db(S, valid).masked_fill(~valid[:, None, :], 0.0)
+
+        if self.max_len is None:
+            delta = self._delta(S_db, 1, n_frames)
+            delta2 = self._delta(S_db, 2, n_frames)
+            stacked = torch.stack([S_db, delta, delta2], dim=1)
+            return stacked.masked_fill(~valid[:, None, None, :], 0.0), n_frames
+
+        # Same zero pad / truncate as preprocess_audio, before the deltas
+        if T < self.max_len:
+            S_db = F.pad(S_db, (0, self.max_len - T))
+        else:
+            S_db = S_db[..., :self.max_len]
+        clip_frames = torch.full_like(n_frames, self.max_len)
+        stacked = torch.stack([S_db, self._delta(S_db, 1, clip_frames), self._delta(S_db, 2, clip_frames)], dim=1)
+
+        mean = stacked.mean(dim=(2, 3), keepdim=True)
+        std = stacked.std(dim=(2, 3), keepdim=True, unbiased=False)
+        return (stacked - mean) / std
+
+
+class FusedStutterModel(nn.Module):
+    """Waveforms in, (bin_out, seq_out) out: feature extraction and inference in one pass."""
+
+    def __init__(self, model, frontend=None):
+        super().__init__()
+        self.frontend = frontend or TorchFeatureFrontend()
+        self.model = model
+
+    def forward(self, waveforms, lengths=None):
+        return self.model(self.frontend(waveforms, lengths))
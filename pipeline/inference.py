@@ -0,0 +1,142 @@
+import time
+
+import numpy as np
+import librosa
+import torch
+
+from model import CNN_BiGRU_StutterTiming, WINDOW_SIZE, HOP_SIZE, BS
+from pipeline.frames import SAMPLE_RATE, N_MELS, HOP_LENGTH
+
+MODEL_PATH = "stutter_model_full.pt"
+
+# 🔹 Load weights memory-mapped (torch >= 2.1) so loading is fast and processes share pages
+def load_state_dict(path):
+    try:
+        return torch.load(path, map_location=torch.device('cpu'), mmap=True, weights_only=True)
+    except (TypeError, RuntimeError):
+        # Older torch, or a checkpoint saved in the legacy (non-zip) format
+        return torch.load(path, map_location=torch.device('cpu'))
+
+# 🔹 Load model
+def load_model(path=MODEL_PATH):
+    model = CNN_BiGRU_StutterTiming(sample_shape=(3, 64, WINDOW_SIZE))
+    state_dict = load_state_dict(path)
+    try:
+        model.load_state_dict(state_dict, assign=True)  # keep the mmap-backed tensors, no copy
+    except TypeError:
+        model.load_state_dict(state_dict)
+    model.eval()
+    return model
+
+# 🔹 Sources are a file path or an already-decoded waveform at the target sample rate
+def _load_waveform(source, sr):
+    if isinstance(source, np.ndarray):
+        return source
+    y, _ = librosa.load(source, sr=sr)
+    return y
+
+# 🔹 Bytes a source's cache key is derived from
+def _source_bytes(source):
+    if isinstance(source, np.ndarray):
+        return np.ascontiguousarray(source).tobytes()
+    with open(source, "rb") as f:
+        return f.read()
+
+# 🔹 Preprocess audio for model
+def preprocess_audio(source, sr=SAMPLE_RATE, n_mels=N_MELS, max_len=128, hop_length=HOP_LENGTH, cache=None):
+    def compute():
+        y = _load_waveform(source, sr)
+        S = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=n_mels, hop_length=hop_length)
+        S_db = librosa.power_to_db(S, ref=np.max)
+
+        if S_db.shape[1] < max_len:
+            S_db = np.pad(S_db, ((0, 0), (0, max_len - S_db.shape[1])), mode='constant')
+        else:
+            S_db = S_db[:, :max_len]
+
+        delta = librosa.feature.delta(S_db)
+        delta2 = librosa.feature.delta(S_db, order=2)
+
+        for arr in [S_db, delta, delta2]:
+            arr -= np.mean(arr)
+            arr /= np.std(arr)
+
+        return np.stack([S_db, delta, delta2], axis=0)
+
+    if cache is None:
+        stacked = compute()
+    else:
+        stacked = cache.get_or_compute(_source_bytes(source), compute, kind="clip",
+                                       sr=sr, n_mels=n_mels, hop_length=hop_length, max_len=max_len)
+    return torch.tensor(np.array(stacked), dtype=torch.float32).unsqueeze(0)
+
+# 🔹 Full-length features (no padding / truncation)
+def compute_full_features(y, sr=SAMPLE_RATE, n_mels=N_MELS, hop_length=HOP_LENGTH):
+    S = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=n_mels, hop_length=hop_length)
+    S_db = librosa.power_to_db(S, ref=np.max)
+    delta = librosa.feature.delta(S_db)
+    delta2 = librosa.feature.delta(S_db, order=2)
+    return np.stack([S_db, delta, delta2], axis=0).astype(np.float32)
+
+def load_full_features(source, sr=SAMPLE_RATE, n_mels=N_MELS, hop_length=HOP_LENGTH, cache=None):
+    def compute():
+        return compute_full_features(_load_waveform(source, sr), sr=sr, n_mels=n_mels, hop_length=hop_length)
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(_source_bytes(source), compute, kind="full",
+                                sr=sr, n_mels=n_mels, hop_length=hop_length)
+
+# 🔹 Cut a (3, n_mels, T) feature stack into overlapping windows
+def frame_windows(features, window_size=WINDOW_SIZE, hop_size=HOP_SIZE):
+    n_frames = features.shape[-1]
+    if n_frames < window_size:
+        features = np.pad(features, ((0, 0), (0, 0), (0, window_size - n_frames)), mode='constant')
+        n_frames = window_size
+
+    starts = list(range(0, n_frames - window_size + 1, hop_size))
+    if starts[-1] + window_size < n_frames:
+        starts.append(n_frames - window_size)  # cover the tail
+    starts = np.asarray(starts)
+
+    windows = np.lib.stride_tricks.sliding_window_view(features, window_size, axis=-1)
+    windows = windows[:, :, starts]                  # (3, n_mels, N, W)
+    windows = np.ascontiguousarray(windows.transpose(2, 0, 1, 3))  # (N, 3, n_mels, W)
+
+    # Same per-channel normalization preprocess_audio applies to a single clip
+    mean = windows.mean(axis=(2, 3), keepdims=True)
+    std = windows.std(axis=(2, 3), keepdims=True)
+    windows = (windows - mean) / np.where(std > 0, std, 1.0)
+    return windows.astype(np.float32), starts
+
+# 🔹 Overlap-average per-window seq_out probabilities into one timeline
+def merge_windows(seq_probs, starts, n_frames, window_size=WINDOW_SIZE):
+    timeline_len = max(n_frames, window_size)
+    seq_sum = np.zeros((timeline_len, seq_probs.shape[2]), dtype=np.float32)
+    counts = np.zeros(timeline_len, dtype=np.float32)
+    for start, probs in zip(starts, seq_probs):
+        seq_sum[start:start + window_size] += probs
+        counts[start:start + window_size] += 1
+    return (seq_sum / counts[:, None])[:n_frames]
+
+# 🔹 Batched sliding-window inference with overlap-averaged timeline
+def predict_windowed(model, features, window_size=WINDOW_SIZE, hop_size=HOP_SIZE, batch_size=BS):
+    n_frames = features.shape[-1]
+    windows, starts = frame_windows(features, window_size, hop_size)
+
+    bin_probs, seq_probs = [], []
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        for i in range(0, len(windows), batch_size):
+            bin_pred, seq_pred = model(torch.from_numpy(windows[i:i + batch_size]))
+            bin_probs.append(torch.sigmoid(bin_pred).squeeze(1).numpy())
+            seq_probs.append(torch.sigmoid(seq_pred).numpy())  # (B, W, n_types)
+    elapsed = time.perf_counter() - t0
+
+    seq_timeline = merge_windows(np.concatenate(seq_probs), starts, n_frames, window_size)
+    stats = {
+        "windows": len(windows),
+        "seconds": elapsed,
+        "windows_per_sec": len(windows) / elapsed if elapsed > 0 else float("inf"),
+    }
+    return np.concatenate(bin_probs), seq_timeline, stats
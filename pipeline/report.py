@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from pipeline.events import TYPE_NAMES
+
+# fpdf2's replacement for ln=1: continue at the left margin on the next line
+NEXT_LINE = {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}
+
+
+def _latin1(text):
+    # The core PDF fonts only cover latin-1
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+def _pdf_bytes(pdf):
+    # fpdf2: output() with no destination returns the document as a bytearray
+    return bytes(pdf.output())
+
+
+def build_session_report(transcript_text, bin_prob, type_counts, alignment=None, model_version=None, threshold=0.5):
+    """Render the clinical session report (summary, type counts, event table, transcript) to PDF bytes."""
+    pdf = FPDF()
+    pdf.add_page()
+
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, "Stuttering Session Report", **NEXT_LINE)
+    pdf.set_font("Helvetica", size=10)
+    pdf.cell(0, 6, f"Generated {datetime.now():%Y-%m-%d %H:%M}", **NEXT_LINE)
+    if model_version:
+        pdf.cell(0, 6, _latin1(f"Model version: {model_version}"), **NEXT_LINE)
+    pdf.ln(4)
+
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 8, "Summary", **NEXT_LINE)
+    pdf.set_font("Helvetica", size=11)
+    verdict = "Stutter detected" if bin_prob > threshold else "No stutter detected"
+    pdf.cell(0, 7, f"{verdict} (binary stutter probability: {bin_prob:.3f})", **NEXT_LINE)
+    for t in TYPE_NAMES:
+        pdf.cell(0, 7, f"{t}: {type_counts.get(t, 0)}", **NEXT_LINE)
+    pdf.ln(4)
+
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 8, "Detected events", **NEXT_LINE)
+    if alignment is None or len(alignment) == 0:
+        pdf.set_font("Helvetica", size=11)
+        pdf.cell(0, 7, "No confident events found.", **NEXT_LINE)
+    else:
+        widths = (25, 25, 40, 100)
+        pdf.set_font("Helvetica", "B", 10)
+        for w, header in zip(widths, ("Start (s)", "End (s)", "Type", "Transcript")):
+            pdf.cell(w, 7, header, border=1)
+        pdf.ln()
+        pdf.set_font("Helvetica", size=9)
+        for row in alignment.itertuples(index=False):
+            spoken = row.words or row.text
+            if len(spoken) > 60:
+                spoken = spoken[:57] + "..."
+            pdf.cell(widths[0], 6, f"{row.start:.2f}", border=1)
+            pdf.cell(widths[1], 6, f"{row.end:.2f}", border=1)
+            pdf.cell(widths[2], 6, row.type, border=1)
+            pdf.cell(widths[3], 6, _latin1(spoken), border=1)
+            pdf.ln()
+    pdf.ln(4)
+
+    pdf.set_font("Helvetica", "B", 12)
+    pdf.cell(0, 8, "Transcript", **NEXT_LINE)
+    pdf.set_font("Helvetica", size=11)
+    for line in transcript_text.split("\n"):
+        pdf.multi_cell(0, 7, _latin1(line), **NEXT_LINE)
+
+    return _pdf_bytes(pdf)
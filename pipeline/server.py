@@ -0,0 +1,294 @@
+"""Local inference service: one process owns the stutter model and Whisper.
+
+    python -m pipeline.server --port 8765
+
+Stutter requests are queued and collected into micro-batches (up to
+--max-batch windows, waiting at most --max-wait-ms for more to arrive) so
+concurrent Streamlit sessions share forward passes instead of contending for
+CPU threads. Whisper requests run one at a time on their own worker thread;
+recordings longer than LONG_FORM_SECONDS are split at silences and fanned out
+to --whisper-workers processes.
+
+Without --model the stutter model follows the ModelRegistry: the active
+version is looked up before every forward pass, so activating a version on
+the admin page takes effect without a restart, and /detect reports which
+version answered.
+
+Endpoints
+  POST /detect?full_length=1   raw audio bytes → bin_prob, seq_probs, stats
+  POST /transcribe             raw audio bytes → text, segments
+  GET  /metrics                queue depth, batch size histogram, p50/p99 latency
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+import whisper
+from aiohttp import web
+
+from pipeline.audio import SAMPLE_RATE, decode_audio
+from pipeline.backends import load_backend
+from pipeline.transcription import LONG_FORM_SECONDS, TRANSCRIBE_OPTIONS, WORKERS, LongFormTranscriber
+from pipeline.inference import preprocess_audio, load_full_features, frame_windows, merge_windows
+from storage.feature_cache import FeatureCache
+from storage.model_registry import ModelRegistry
+from storage.transcript_cache import TranscriptCache
+
+WHISPER_MODEL = "base"
+LATENCY_WINDOW = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class Metrics:
+    def __init__(self):
+        self.batch_sizes = Counter()
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.requests = Counter()
+
+    def observe(self, endpoint, seconds):
+        self.requests[endpoint] += 1
+        self.latencies[endpoint].append(seconds)
+
+    def snapshot(self, queue_depth):
+        latency = {}
+        for endpoint, values in self.latencies.items():
+            values = np.asarray(values) * 1e3
+            latency[endpoint] = {
+                "count": self.requests[endpoint],
+                "p50_ms": float(np.percentile(values, 50)),
+                "p99_ms": float(np.percentile(values, 99)),
+            }
+        return {
+            "queue_depth": queue_depth,
+            "batch_sizes": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+            "latency": latency,
+        }
+
+
+def model_source(backend=None, path=None, registry=None):
+    """→ callable returning (version, model).
+
+    With an explicit path the same model is always served (version None).
+    Otherwise the registry's active version is resolved on every call; until
+    something is registered the default weights for the backend are used.
+    """
+    if path is not None:
+        model = load_backend(backend, path)
+        return lambda: (None, model)
+
+    registry = registry or ModelRegistry()
+    fallback = None
+
+    def get():
+        nonlocal fallback
+        if registry.active_version() is not None:
+            return registry.get_model(kind=backend)
+        if fallback is None:
+            fallback = load_backend(backend)
+        return None, fallback
+
+    return get
+
+
+class MicroBatcher:
+    """Collects model inputs from concurrent requests into shared forward passes."""
+
+    def __init__(self, get_model, executor, metrics, max_batch=64, max_wait_ms=10):
+        self.get_model = get_model
+        self.executor = executor
+        self.metrics = metrics
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+
+    async def submit(self, inputs):
+        """inputs (N, 3, n_mels, T) float32 → (bin_probs (N,), seq_probs (N, T, n_types), model version)."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((inputs, future))
+        return await future
+
+    def _forward(self, batch):
+        # Resolved once per batch: every window of a request is scored by the same version
+        version, model = self.get_model()
+        # One long request alone can exceed max_batch windows: never run more than that at once
+        bin_probs, seq_probs = [], []
+        with torch.no_grad():
+            for i in range(0, len(batch), self.max_batch):
+                bin_pred, seq_pred = model(torch.from_numpy(batch[i:i + self.max_batch]))
+                bin_probs.append(torch.sigmoid(bin_pred).squeeze(1).numpy())
+                seq_probs.append(torch.sigmoid(seq_pred).numpy())
+        return np.concatenate(bin_probs), np.concatenate(seq_probs), version
+
+    async def run(self):
+        while True:
+            try:
+                await self._step()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # A failed step must not take the batcher down: later requests would hang forever
+                logger.exception("micro-batch step failed")
+
+    async def _step(self):
+        loop = asyncio.get_running_loop()
+        items = [await self.queue.get()]
+        size = len(items[0][0])
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            size += len(item[0])
+
+        # Inputs of different time length can't share a tensor
+        by_shape = defaultdict(list)
+        for inputs, future in items:
+            by_shape[inputs.shape[1:]].append((inputs, future))
+        for group in by_shape.values():
+            # Requests whose client went away are already cancelled: skip their windows
+            group = [(inputs, future) for inputs, future in group if not future.done()]
+            if not group:
+                continue
+            batch = np.concatenate([inputs for inputs, _ in group])
+            for i in range(0, len(batch), self.max_batch):
+                self.metrics.batch_sizes[min(self.max_batch, len(batch) - i)] += 1
+            try:
+                bin_probs, seq_probs, version = await loop.run_in_executor(self.executor, self._forward, batch)
+            except Exception as e:
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            offset = 0
+            for inputs, future in group:
+                n = len(inputs)
+                if not future.done():
+                    future.set_result((bin_probs[offset:offset + n], seq_probs[offset:offset + n], version))
+                offset += n
+
+
+def create_app(get_model, whisper_model, max_batch=64, max_wait_ms=10, long_form=None):
+    metrics = Metrics()
+    cpu_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="features")
+    model_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model")
+    whisper_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+    batcher = MicroBatcher(get_model, model_pool, metrics, max_batch, max_wait_ms)
+    feature_cache = FeatureCache()
+    transcript_cache = TranscriptCache()
+
+    def prepare(audio_bytes, full_length):
+        y = decode_audio(audio_bytes)
+        if full_length:
+            features = load_full_features(y, cache=feature_cache)
+            windows, starts = frame_windows(features)
+            return windows, starts, features.shape[-1]
+        return preprocess_audio(y, cache=feature_cache).numpy(), None, None
+
+    def transcribe(audio_bytes):
+        key = transcript_cache.make_key(hashlib.sha256(audio_bytes).hexdigest(), WHISPER_MODEL + "+words")
+        cached = transcript_cache.get(key)
+        if cached is not None:
+            return cached
+        y = decode_audio(audio_bytes)
+        if long_form is not None and len(y) > LONG_FORM_SECONDS * SAMPLE_RATE:
+            text, segments = long_form.transcribe(y)
+        else:
+            result = whisper_model.transcribe(y, **TRANSCRIBE_OPTIONS)
+            text, segments = result["text"], result["segments"]
+        transcript_cache.put(key, text, segments)
+        return text, segments
+
+    async def detect(request):
+        t0 = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        full_length = request.query.get("full_length", "1") == "1"
+        audio_bytes = await request.read()
+        inputs, starts, n_frames = await loop.run_in_executor(cpu_pool, prepare, audio_bytes, full_length)
+
+        t_model = time.perf_counter()
+        bin_probs, seq_probs, version = await batcher.submit(inputs)
+        model_seconds = time.perf_counter() - t_model
+        if full_length:
+            bin_prob = float(bin_probs.max())
+            seq_probs = merge_windows(seq_probs, starts, n_frames)
+        else:
+            bin_prob = float(bin_probs[0])
+            seq_probs = seq_probs[0]
+
+        metrics.observe("detect", time.perf_counter() - t0)
+        return web.json_response({
+            "bin_prob": bin_prob,
+            "seq_probs": seq_probs.tolist(),
+            "stats": {
+                "model_version": version,
+                "windows": len(inputs),
+                "seconds": model_seconds,
+                "windows_per_sec": len(inputs) / model_seconds if model_seconds > 0 else float("inf"),
+            },
+        })
+
+    async def transcribe_handler(request):
+        t0 = time.perf_counter()
+        audio_bytes = await request.read()
+        text, segments = await asyncio.get_running_loop().run_in_executor(whisper_pool, transcribe, audio_bytes)
+        metrics.observe("transcribe", time.perf_counter() - t0)
+        return web.json_response({"text": text, "segments": segments}, dumps=_dumps)
+
+    async def metrics_handler(request):
+        return web.json_response(metrics.snapshot(batcher.queue.qsize()))
+
+    async def start_batcher(app):
+        app["batcher_task"] = asyncio.create_task(batcher.run())
+
+    async def stop_batcher(app):
+        app["batcher_task"].cancel()
+
+    app = web.Application(client_max_size=1024 ** 3)
+    app.add_routes([
+        web.post("/detect", detect),
+        web.post("/transcribe", transcribe_handler),
+        web.get("/metrics", metrics_handler),
+    ])
+    app.on_startup.append(start_batcher)
+    app.on_cleanup.append(stop_batcher)
+    return app
+
+
+# Whisper segments can hold numpy scalars
+def _dumps(obj):
+    return json.dumps(obj, default=float)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=64, help="max windows per forward pass")
+    parser.add_argument("--max-wait-ms", type=float, default=10, help="time budget for filling a batch")
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--model", default=None, help="serve this artifact instead of the registry's active version")
+    parser.add_argument("--whisper-workers", type=int, default=WORKERS,
+                        help="processes for long-form transcription (1 disables chunking)")
+    args = parser.parse_args(argv)
+
+    long_form = LongFormTranscriber(WHISPER_MODEL, args.whisper_workers) if args.whisper_workers > 1 else None
+    app = create_app(model_source(args.backend, args.model), whisper.load_model(WHISPER_MODEL),
+                     args.max_batch, args.max_wait_ms, long_form)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Memory-mapped sharded store of precomputed training windows.
+
+Layout of a store directory:
+
+    index.json                       parameters, per-shard window counts and
+                                     each recording's [id, first window, count]
+    shard-00000.features.npy         (N, 3, n_mels, WINDOW_SIZE) float32, normalized
+    shard-00000.bin.npy              (N,) float32 binary labels
+    shard-00000.seq.npy              (N, WINDOW_SIZE, n_types) uint8 frame labels
+
+Every shard is preallocated for shard_size windows (the last one may be
+partially filled; its real count is in the index). Readers open the arrays
+with mmap, so DataLoader workers share pages and do no librosa work.
+
+Windows overlap (WINDOW_SIZE frames at HOP_SIZE), so train/valid splits are
+made by recording, never by window.
+"""
+import bisect
+import json
+import os
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from model import WINDOW_SIZE, HOP_SIZE, BS
+from pipeline.events import TYPE_NAMES
+from pipeline.frames import FRAME_DURATION
+
+INDEX_FILE = "index.json"
+SHARD_SIZE = 4096
+
+
+def _shard_paths(root, shard_id):
+    prefix = os.path.join(root, f"shard-{shard_id:05d}")
+    return f"{prefix}.features.npy", f"{prefix}.bin.npy", f"{prefix}.seq.npy"
+
+
+# 🔹 Frame-level labels for a whole recording from its event list (seconds → feature hops)
+def frame_labels(events, n_frames, frame_duration=FRAME_DURATION):
+    labels = np.zeros((n_frames, len(TYPE_NAMES)), dtype=np.uint8)
+    for ev in events:
+        start = int(round(ev["start"] / frame_duration))
+        end = int(round(ev["end"] / frame_duration))
+        labels[start:end, TYPE_NAMES.index(ev["type"])] = 1
+    return labels
+
+
+# 🔹 Per-window label slices matching pipeline.inference.frame_windows
+def window_labels(labels, starts, window_size=WINDOW_SIZE):
+    if len(labels) < window_size:
+        labels = np.pad(labels, ((0, window_size - len(labels)), (0, 0)))
+    seq = np.stack([labels[s:s + window_size] for s in starts])
+    return seq, seq.any(axis=(1, 2)).astype(np.float32)
+
+
+class ShardWriter:
+    def __init__(self, root, n_mels=64, window_size=WINDOW_SIZE, hop_size=HOP_SIZE, shard_size=SHARD_SIZE):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.n_mels = n_mels
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.shard_size = shard_size
+        self.counts = []
+        self.recordings = []
+        self._arrays = None
+        self._filled = 0
+
+    def _open_shard(self):
+        features_path, bin_path, seq_path = _shard_paths(self.root, len(self.counts))
+        fmt = np.lib.format
+        self._arrays = (
+            fmt.open_memmap(features_path, mode="w+", dtype=np.float32,
+                            shape=(self.shard_size, 3, self.n_mels, self.window_size)),
+            fmt.open_memmap(bin_path, mode="w+", dtype=np.float32, shape=(self.shard_size,)),
+            fmt.open_memmap(seq_path, mode="w+", dtype=np.uint8,
+                            shape=(self.shard_size, self.window_size, len(TYPE_NAMES))),
+        )
+        self._filled = 0
+        self.counts.append(0)
+
+    def add(self, windows, bin_labels, seq_labels, recording_id=None):
+        """Append one recording's windows; recording_id keys the train/valid split."""
+        if recording_id is None:
+            recording_id = str(len(self.recordings))
+        self.recordings.append([str(recording_id), sum(self.counts), len(windows)])
+        offset = 0
+        while offset < len(windows):
+            if self._arrays is None or self._filled == self.shard_size:
+                self._close_shard()
+                self._open_shard()
+            n = min(self.shard_size - self._filled, len(windows) - offset)
+            features, bins, seqs = self._arrays
+            features[self._filled:self._filled + n] = windows[offset:offset + n]
+            bins[self._filled:self._filled + n] = bin_labels[offset:offset + n]
+            seqs[self._filled:self._filled + n] = seq_labels[offset:offset + n]
+            self._filled += n
+            self.counts[-1] = self._filled
+            offset += n
+
+    def _close_shard(self):
+        if self._arrays is not None:
+            for array in self._arrays:
+                array.flush()
+            self._arrays = None
+
+    def close(self):
+        self._close_shard()
+        with open(os.path.join(self.root, INDEX_FILE), "w") as f:
+            json.dump({
+                "n_mels": self.n_mels,
+                "window_size": self.window_size,
+                "hop_size": self.hop_size,
+                "shard_size": self.shard_size,
+                "type_names": TYPE_NAMES,
+                "shards": self.counts,
+                "recordings": self.recordings,
+            }, f, indent=2)
+
+
+class ShardedWindowDataset(Dataset):
+    """(features, bin_label, seq_label) windows read from a shard store via mmap."""
+
+    def __init__(self, root, indices=None):
+        with open(os.path.join(root, INDEX_FILE)) as f:
+            self.index = json.load(f)
+        self.root = root
+        self.offsets = np.cumsum([0] + self.index["shards"]).tolist()
+        self.indices = np.arange(self.offsets[-1]) if indices is None else np.asarray(indices)
+        self._shards = {}
+
+    def __len__(self):
+        return len(self.indices)
+
+    def _shard(self, shard_id):
+        # Opened lazily so each DataLoader worker maps the files itself
+        if shard_id not in self._shards:
+            self._shards[shard_id] = tuple(np.load(p, mmap_mode="r") for p in _shard_paths(self.root, shard_id))
+        return self._shards[shard_id]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shards"] = {}
+        return state
+
+    def __getitem__(self, i):
+        global_idx = int(self.indices[i])
+        shard_id = bisect.bisect_right(self.offsets, global_idx) - 1
+        features, bins, seqs = self._shard(shard_id)
+        j = global_idx - self.offsets[shard_id]
+        return (torch.from_numpy(np.array(features[j])),
+                torch.tensor(bins[j]).unsqueeze(0),
+                torch.from_numpy(seqs[j].astype(np.float32)))
+
+
+def split_dataset(root, valid_pct=0.2, seed=42):
+    """Train/valid datasets with whole recordings on each side.
+
+    Recordings are shuffled and each goes to valid when that brings valid
+    closer to valid_pct of the windows, so overlapping windows of one
+    recording never straddle the split.
+    """
+    with open(os.path.join(root, INDEX_FILE)) as f:
+        recordings = json.load(f).get("recordings")
+    if not recordings:
+        raise ValueError(f"{root} has no per-recording index; rebuild it with tools.build_shards")
+
+    target = valid_pct * sum(count for _, _, count in recordings)
+    train, valid, n_valid = [], [], 0
+    for i in np.random.default_rng(seed).permutation(len(recordings)):
+        _, first, count = recordings[i]
+        if abs(n_valid + count - target) < abs(n_valid - target):
+            valid.append(np.arange(first, first + count))
+            n_valid += count
+        else:
+            train.append(np.arange(first, first + count))
+
+    def indices(parts):
+        return np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    return ShardedWindowDataset(root, indices(train)), ShardedWindowDataset(root, indices(valid))
+
+
+# 🔹 Plain PyTorch loader
+def make_torch_loader(dataset, bs=BS, shuffle=True, num_workers=4):
+    return torch.utils.data.DataLoader(dataset, batch_size=bs, shuffle=shuffle, num_workers=num_workers,
+                                       pin_memory=torch.cuda.is_available(), persistent_workers=num_workers > 0,
+                                       drop_last=shuffle)
+
+
+# 🔹 fastai DataLoaders: batches are (x, bin_label, seq_label), so n_inp=1 and the loss gets both targets
+def make_fastai_dataloaders(root, valid_pct=0.2, bs=BS, num_workers=4, seed=42):
+    from fastai.data.core import DataLoaders
+    from fastai.data.load import DataLoader
+
+    train_ds, valid_ds = split_dataset(root, valid_pct, seed)
+    dls = DataLoaders(
+        DataLoader(train_ds, bs=bs, shuffle=True, drop_last=True, num_workers=num_workers),
+        DataLoader(valid_ds, bs=bs, shuffle=False, num_workers=num_workers),
+    )
+    # Without this Learner splits (x, bin, seq) as two inputs and one target
+    dls.n_inp = 1
+    return dls
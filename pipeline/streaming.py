@@ -0,0 +1,155 @@
+"""Chunked / live-microphone stutter detection.
+
+Audio arrives in arbitrary-size chunks. Mel frames are computed incrementally
+from a small sample ring buffer and kept in a ring of the last context_frames
+frames. Every step_frames new frames the model runs over that context window;
+large chunks are ingested step by step, so no frame leaves the ring before
+it has been committed. The GRU is bidirectional, so the newest frames have no right context yet:
+only frames at least lookahead_frames behind the live edge are committed.
+That bounds event latency to roughly (step_frames + lookahead_frames) hops.
+"""
+import time
+from collections import deque
+
+import numpy as np
+import librosa
+import torch
+
+from model import WINDOW_SIZE, HOP_SIZE
+from pipeline.events import TYPE_NAMES, THRESHOLD
+from pipeline.frames import SAMPLE_RATE, N_MELS, HOP_LENGTH, frame_duration
+
+MIN_FRAMES = 9  # librosa.feature.delta needs a full 9-frame window
+
+
+class StreamingDetector:
+    def __init__(self, model, sr=SAMPLE_RATE, n_mels=N_MELS, n_fft=2048, hop_length=HOP_LENGTH,
+                 context_frames=WINDOW_SIZE, step_frames=HOP_SIZE, lookahead_frames=8,
+                 threshold=THRESHOLD):
+        if step_frames + lookahead_frames > context_frames:
+            raise ValueError("step_frames + lookahead_frames must fit inside context_frames")
+        self.model = model
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.context_frames = context_frames
+        self.step_frames = step_frames
+        self.lookahead_frames = lookahead_frames
+        self.threshold = threshold
+        self.frame_duration = frame_duration(sr, hop_length)
+        self.sr = sr
+
+        self._mel_basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels)
+        self._window = librosa.filters.get_window("hann", n_fft, fftbins=True).astype(np.float32)
+
+        # Leading zeros reproduce librosa's center=True padding at the start of the stream
+        self._samples = np.zeros(n_fft // 2, dtype=np.float32)
+        self._mel = deque(maxlen=context_frames)
+        self._n_frames = 0
+        self._pending_frames = 0
+        self._committed = 0
+        self._active_start = [None] * len(TYPE_NAMES)
+        self._audio_samples = 0
+
+        self.chunk_latencies = []
+        self.cpu_seconds = 0.0
+
+    # 🔹 New samples → at most max_frames new mel power frames
+    def _extract_frames(self, max_frames=None):
+        if len(self._samples) < self.n_fft:
+            return 0
+        n_new = (len(self._samples) - self.n_fft) // self.hop_length + 1
+        if max_frames is not None:
+            n_new = min(n_new, max_frames)
+        frames = np.lib.stride_tricks.sliding_window_view(self._samples, self.n_fft)[::self.hop_length][:n_new]
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2
+        self._mel.extend(power @ self._mel_basis.T)
+        self._samples = self._samples[n_new * self.hop_length:]
+        self._n_frames += n_new
+        self._pending_frames += n_new
+        return n_new
+
+    # 🔹 Same features as preprocess_audio, on the current context window
+    def _window_features(self):
+        S_db = librosa.power_to_db(np.stack(self._mel, axis=1), ref=np.max)
+        delta = librosa.feature.delta(S_db)
+        delta2 = librosa.feature.delta(S_db, order=2)
+        for arr in [S_db, delta, delta2]:
+            arr -= np.mean(arr)
+            std = np.std(arr)
+            arr /= std if std > 0 else 1.0  # digital silence (muted mic) is flat: leave it at zero
+        return torch.tensor(np.stack([S_db, delta, delta2], axis=0), dtype=torch.float32).unsqueeze(0)
+
+    # 🔹 Run the model and commit every frame that now has enough right context
+    def _run(self, lookahead):
+        self._pending_frames = 0
+        with torch.no_grad():
+            _, seq_pred = self.model(self._window_features())
+            probs = torch.sigmoid(seq_pred).squeeze(0).numpy()
+
+        window_start = self._n_frames - len(self._mel)
+        commit_until = self._n_frames - lookahead
+        events = []
+        for t in range(max(self._committed, window_start), commit_until):
+            active = probs[t - window_start] > self.threshold
+            for type_idx, is_active in enumerate(active):
+                start = self._active_start[type_idx]
+                if is_active and start is None:
+                    self._active_start[type_idx] = t
+                elif not is_active and start is not None:
+                    events.append(self._event(type_idx, start, t))
+                    self._active_start[type_idx] = None
+        self._committed = max(self._committed, commit_until)
+        return events
+
+    def _event(self, type_idx, start_frame, end_frame):
+        return (TYPE_NAMES[type_idx],
+                round(start_frame * self.frame_duration, 2),
+                round(end_frame * self.frame_duration, 2))
+
+    # 🔹 Extract a step of frames at a time and run the model after each full step
+    def _ingest(self):
+        events = []
+        while True:
+            if not self._extract_frames(max(1, self.step_frames - self._pending_frames)):
+                return events
+            if (self._pending_frames >= self.step_frames
+                    and self._n_frames >= max(MIN_FRAMES, self.lookahead_frames + 1)):
+                events += self._run(self.lookahead_frames)
+
+    def push(self, chunk):
+        """Feed a chunk of 16 kHz mono samples; returns events that closed during it."""
+        t0, c0 = time.perf_counter(), time.process_time()
+        chunk = np.asarray(chunk, dtype=np.float32)
+        self._audio_samples += len(chunk)
+        self._samples = np.concatenate([self._samples, chunk])
+        events = self._ingest()
+
+        self.chunk_latencies.append(time.perf_counter() - t0)
+        self.cpu_seconds += time.process_time() - c0
+        return events
+
+    def flush(self):
+        """End of stream: score the tail without lookahead and close open events."""
+        self._samples = np.concatenate([self._samples, np.zeros(self.n_fft // 2, dtype=np.float32)])
+        events = self._ingest()
+        if self._n_frames >= MIN_FRAMES:
+            events += self._run(0)
+        for type_idx, start in enumerate(self._active_start):
+            if start is not None:
+                events.append(self._event(type_idx, start, self._n_frames))
+                self._active_start[type_idx] = None
+        return events
+
+    def stats(self):
+        latencies = np.asarray(self.chunk_latencies) * 1e3
+        audio_seconds = self._audio_samples / self.sr
+        return {
+            "chunks": len(latencies),
+            "latency_ms_p50": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            "latency_ms_p95": float(np.percentile(latencies, 95)) if len(latencies) else 0.0,
+            "latency_ms_max": float(latencies.max()) if len(latencies) else 0.0,
+            "cpu_seconds": self.cpu_seconds,
+            "audio_seconds": audio_seconds,
+            "real_time_factor": self.cpu_seconds / audio_seconds if audio_seconds else 0.0,
+            "event_delay_s": (self.step_frames + self.lookahead_frames) * self.frame_duration,
+        }
@@ -0,0 +1,91 @@
+"""Per-stage timing spans for the analysis pipeline, persisted to SQLite.
+
+    trace_id = new_trace_id()
+    with span("transcribe", trace_id):
+        ...
+
+Each span is one row (trace_id, stage, started_at, duration_ms). Writes use
+a per-thread connection so the worker threads in therapist_home can record
+spans concurrently; admin_models reads them back with load_spans().
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+TRACE_DB = os.getenv("TRACE_DB", "pipeline_traces.db")
+
+logger = logging.getLogger(__name__)
+_local = threading.local()
+
+
+def _connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(TRACE_DB, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS spans (
+                trace_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                duration_ms REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS spans_started_at ON spans (started_at)")
+        _local.conn = conn
+    return conn
+
+
+def new_trace_id():
+    return uuid.uuid4().hex
+
+
+def record(trace_id, stage, started_at, duration_ms):
+    logger.info("trace=%s stage=%s ms=%.1f", trace_id, stage, duration_ms)
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("INSERT INTO spans VALUES (?, ?, ?, ?)", (trace_id, stage, started_at, duration_ms))
+    except sqlite3.Error as e:
+        # Tracing must never break a prediction
+        logger.warning("Failed to persist span %s: %s", stage, e)
+
+
+@contextmanager
+def span(stage, trace_id=None):
+    started_at = time.time()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(trace_id or "-", stage, started_at, (time.perf_counter() - t0) * 1e3)
+
+
+def load_spans(since_seconds=7 * 24 * 3600):
+    if not os.path.exists(TRACE_DB):
+        return pd.DataFrame(columns=["trace_id", "stage", "started_at", "duration_ms"])
+    with sqlite3.connect(TRACE_DB) as conn:
+        return pd.read_sql_query(
+            "SELECT trace_id, stage, started_at, duration_ms FROM spans WHERE started_at >= ?",
+            conn, params=(time.time() - since_seconds,),
+        )
+
+
+def stage_percentiles(spans):
+    if spans.empty:
+        return pd.DataFrame()
+    grouped = spans.groupby("stage")["duration_ms"]
+    table = pd.DataFrame({
+        "count": grouped.count(),
+        "p50 (ms)": grouped.quantile(0.50),
+        "p90 (ms)": grouped.quantile(0.90),
+        "p99 (ms)": grouped.quantile(0.99),
+        "max (ms)": grouped.max(),
+    })
+    return table.sort_values("p50 (ms)", ascending=False).round(1)
@@ -0,0 +1,94 @@
+"""Long-form Whisper: split at silence, transcribe chunks in a process pool, stitch.
+
+Recordings longer than LONG_FORM_SECONDS are cut close to every CHUNK_SECONDS
+mark, at the quietest 50 ms frame within ±SEARCH_SECONDS, so words are not split
+across chunks. Chunks are transcribed in parallel by worker processes that each
+load Whisper once. Segment (and word) timestamps are shifted back onto the
+original timeline, and the result keeps the usual (text, segments) shape.
+
+Workers and chunk length come from WHISPER_WORKERS / WHISPER_CHUNK_SECONDS.
+Every caller transcribes with TRANSCRIBE_OPTIONS, which turns on word timestamps
+so stutter events can be aligned to individual words.
+"""
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pipeline.audio import SAMPLE_RATE
+
+CHUNK_SECONDS = float(os.environ.get("WHISPER_CHUNK_SECONDS", 120))
+WORKERS = int(os.environ.get("WHISPER_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+LONG_FORM_SECONDS = 2 * CHUNK_SECONDS
+SEARCH_SECONDS = 10
+FRAME_SECONDS = 0.05
+TRANSCRIBE_OPTIONS = {"word_timestamps": True}
+
+
+def split_at_silence(y, sr=SAMPLE_RATE, chunk_seconds=CHUNK_SECONDS, search_seconds=SEARCH_SECONDS):
+    """(start, end) sample ranges covering y, cut at low-energy frames near every chunk_seconds."""
+    frame = int(sr * FRAME_SECONDS)
+    n_frames = len(y) // frame
+    chunk, search = int(chunk_seconds / FRAME_SECONDS), int(search_seconds / FRAME_SECONDS)
+    if n_frames < 2 * chunk:
+        return [(0, len(y))]
+
+    energy = np.square(y[:n_frames * frame].reshape(n_frames, frame)).mean(axis=1)
+    cuts = [0]
+    while cuts[-1] + chunk + chunk // 2 < n_frames:
+        target = cuts[-1] + chunk
+        lo, hi = max(cuts[-1] + 1, target - search), min(n_frames, target + search)
+        cuts.append(lo + int(np.argmin(energy[lo:hi])))
+
+    bounds = [c * frame for c in cuts] + [len(y)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def stitch(results, offsets):
+    """Concatenate per-chunk Whisper results, moving timestamps by each chunk's offset (seconds)."""
+    texts, segments = [], []
+    for result, offset in zip(results, offsets):
+        texts.append(result["text"])
+        for seg in result["segments"]:
+            seg = dict(seg, id=len(segments), start=seg["start"] + offset, end=seg["end"] + offset,
+                       seek=seg.get("seek", 0) + int(round(offset * 100)))
+            if seg.get("words"):
+                seg["words"] = [dict(w, start=w["start"] + offset, end=w["end"] + offset) for w in seg["words"]]
+            segments.append(seg)
+    return "".join(texts), segments
+
+
+# 🔹 Worker side: one Whisper model per process
+_model = None
+
+
+def _init_worker(model_name, threads):
+    global _model
+    import torch
+    import whisper
+    torch.set_num_threads(threads)
+    _model = whisper.load_model(model_name)
+
+
+def _transcribe_chunk(chunk, options):
+    return _model.transcribe(chunk, **options)
+
+
+class LongFormTranscriber:
+    def __init__(self, model_name, workers=WORKERS, chunk_seconds=CHUNK_SECONDS):
+        self.chunk_seconds = chunk_seconds
+        self.workers = workers
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        # spawn: forked children would inherit torch's thread pools from the parent
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                                        initializer=_init_worker, initargs=(model_name, threads))
+
+    def transcribe(self, y, sr=SAMPLE_RATE, **options):
+        chunks = split_at_silence(y, sr, self.chunk_seconds)
+        options = {**TRANSCRIBE_OPTIONS, **options}
+        futures = [self.pool.submit(_transcribe_chunk, y[start:end], options) for start, end in chunks]
+        return stitch([f.result() for f in futures], [start / sr for start, _ in chunks])
+
+    def shutdown(self):
+        self.pool.shutdown(cancel_futures=True)
@@ -0,0 +1,145 @@
+"""Energy-based voice activity detection ahead of feature extraction and ASR.
+
+Frames whose level is well above the recording's own noise floor are voiced.
+Pauses inside speech shorter than min_silence are bridged, blips shorter than
+min_speech are dropped, and every region is padded so onsets and stutter blocks at phrase
+edges survive. Only the voiced regions are concatenated and sent to the
+models. VoicedMap translates times on that compacted signal back to the
+original recording.
+
+A Block stutter is itself a silent pause inside speech, so min_silence is set
+above block length: only pauses of MIN_SILENCE_MS or more are cut (down to
+2 * PAD_MS), and the blocks the stutter model looks for are left intact.
+"""
+import numpy as np
+
+from pipeline.audio import SAMPLE_RATE
+
+FRAME_MS = 30
+MARGIN_DB = 12
+FLOOR_PERCENTILE = 10
+MIN_LEVEL_DB = -60
+MIN_SPEECH_MS = 120
+MIN_SILENCE_MS = 2000  # longer than a Block pause
+PAD_MS = 150
+
+
+def _runs(mask):
+    """Start/end indices of True runs in a boolean array."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_voiced(y, sr=SAMPLE_RATE, frame_ms=FRAME_MS, margin_db=MARGIN_DB,
+                  min_speech_ms=MIN_SPEECH_MS, min_silence_ms=MIN_SILENCE_MS, pad_ms=PAD_MS):
+    """Voiced regions of y as an (N, 2) array of [start, end) sample indices."""
+    frame = int(sr * frame_ms / 1000)
+    n_frames = len(y) // frame
+    if n_frames == 0:
+        return np.array([[0, len(y)]], dtype=np.int64)
+
+    power = np.square(y[:n_frames * frame].reshape(n_frames, frame)).mean(axis=1)
+    level = 10 * np.log10(power + 1e-12)
+    threshold = max(np.percentile(level, FLOOR_PERCENTILE) + margin_db, MIN_LEVEL_DB)
+    voiced = level > threshold
+
+    # Bridge short pauses, then drop short blips
+    starts, ends = _runs(~voiced)
+    for s, e in zip(starts, ends):
+        if s > 0 and e < n_frames and (e - s) * frame_ms < min_silence_ms:
+            voiced[s:e] = True
+    starts, ends = _runs(voiced)
+    keep = (ends - starts) * frame_ms >= min_speech_ms
+    starts, ends = starts[keep], ends[keep]
+    if len(starts) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    pad = int(pad_ms / frame_ms)
+    starts = np.maximum(starts - pad, 0) * frame
+    ends = np.minimum(ends + pad, n_frames) * frame
+    if ends[-1] == n_frames * frame:
+        ends[-1] = len(y)  # keep the trailing partial frame
+
+    # Padding can make neighbours overlap: merge them
+    merged = [[starts[0], ends[0]]]
+    for s, e in zip(starts[1:], ends[1:]):
+        if s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    return np.asarray(merged, dtype=np.int64)
+
+
+class VoicedMap:
+    """Maps times on the voiced-only signal back onto the original recording."""
+
+    def __init__(self, regions, total_samples, sr=SAMPLE_RATE):
+        self.regions = np.asarray(regions, dtype=np.int64).reshape(-1, 2)
+        self.total_samples = total_samples
+        self.sr = sr
+        lengths = self.regions[:, 1] - self.regions[:, 0]
+        self.compact_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else np.zeros(0, np.int64)
+        self.voiced_samples = int(lengths.sum())
+
+    @property
+    def skipped_fraction(self):
+        return 1 - self.voiced_samples / self.total_samples if self.total_samples else 0.0
+
+    def to_original(self, seconds, end=False):
+        """Seconds on the compacted signal → seconds on the original one (scalar or array).
+
+        A time exactly on a splice belongs to the next region when it starts an
+        interval and to the previous one when it ends it (end=True), so an end
+        time never jumps forward over the removed silence.
+        """
+        if len(self.regions) == 0:
+            return seconds
+        samples = np.asarray(seconds, dtype=np.float64) * self.sr
+        side = "left" if end else "right"
+        idx = np.clip(np.searchsorted(self.compact_starts, samples, side=side) - 1, 0, len(self.regions) - 1)
+        original = (self.regions[idx, 0] + samples - self.compact_starts[idx]) / self.sr
+        return original if np.ndim(seconds) else float(original)
+
+    def split(self, start, end):
+        """Compacted [start, end) seconds → one (start, end) piece per voiced region it covers."""
+        if len(self.regions) == 0:
+            return [(start, end)]
+        s, e = start * self.sr, end * self.sr
+        first = int(np.clip(np.searchsorted(self.compact_starts, s, side="right") - 1, 0, len(self.regions) - 1))
+        last = int(np.clip(np.searchsorted(self.compact_starts, e, side="left") - 1, first, len(self.regions) - 1))
+        lengths = self.regions[:, 1] - self.regions[:, 0]
+        pieces = []
+        for k in range(first, last + 1):
+            lo = max(s, self.compact_starts[k])
+            hi = min(e, self.compact_starts[k] + lengths[k])
+            if hi > lo:
+                offset = self.regions[k, 0] - self.compact_starts[k]
+                pieces.append((float((lo + offset) / self.sr), float((hi + offset) / self.sr)))
+        return pieces or [(self.to_original(start), self.to_original(end, end=True))]
+
+    def remap_segments(self, segments):
+        remapped = []
+        for seg in segments:
+            seg = dict(seg, start=self.to_original(seg["start"]), end=self.to_original(seg["end"], end=True))
+            if seg.get("words"):
+                seg["words"] = [dict(w, start=self.to_original(w["start"]), end=self.to_original(w["end"], end=True))
+                                for w in seg["words"]]
+            remapped.append(seg)
+        return remapped
+
+    def remap_events(self, events):
+        """(type, start, end) tuples from the compacted timeline → original timestamps.
+
+        An event that runs across a splice is split into one event per voiced
+        region instead of being stretched over the silence that was removed.
+        """
+        return [(t, s, e) for t, start, end in events for s, e in self.split(start, end)]
+
+
+def apply_vad(y, sr=SAMPLE_RATE, **params):
+    """→ (voiced-only signal, VoicedMap). Returns y unchanged when nothing is voiced."""
+    regions = detect_voiced(y, sr, **params)
+    if len(regions) == 0:
+        return y, VoicedMap([[0, len(y)]], len(y), sr)
+    voiced = np.concatenate([y[s:e] for s, e in regions])
+    return np.ascontiguousarray(voiced, dtype=np.float32), VoicedMap(regions, len(y), sr)
@@ -1,10 +1,103 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 import json
+import numpy as np
+
+from pipeline.tracing import load_spans, stage_percentiles
+from storage.model_registry import ModelRegistry
+
+# 🔹 Interpretation bullets derived from the current metrics
+def interpret_metrics(metrics):
+    notes = []
+
+    recall = metrics["Binary Recall"]
+    precision = metrics["Binary Precision"]
+    if recall >= 0.9:
+        notes.append(f"**High Binary Recall ({recall:.3f})**: Model rarely misses stuttered windows.")
+    else:
+        notes.append(f"**Binary Recall ({recall:.3f})**: Some stuttered windows are missed.")
+    if precision < recall - 0.1:
+        notes.append(f"**Lower Binary Precision ({precision:.3f})**: More false alarms than misses — "
+                     "consider raising the decision threshold.")
+
+    class_f1 = metrics["Class-wise F1"]
+    weakest = min(class_f1, key=class_f1.get)
+    if class_f1[weakest] < 0.5:
+        notes.append(f"**Lower {weakest} F1 ({class_f1[weakest]:.3f})**: May need more training data "
+                     "or better feature separation.")
+    else:
+        notes.append(f"**All stutter types ≥ 0.5 F1** (weakest: {weakest}, {class_f1[weakest]:.3f}).")
+
+    losses = np.asarray(metrics["Loss Curve"], dtype=float)
+    if len(losses) > 1:
+        median = np.median(losses)
+        mad = np.median(np.abs(losses - median)) or 1e-12
+        spikes = int(np.sum(losses > median + 5 * mad))
+        if spikes:
+            notes.append(f"**Loss curve** shows {spikes} spike(s) — consider smoothing or early stopping.")
+        else:
+            notes.append("**Loss curve** is stable across validation batches.")
+
+    return "\n".join(f"- {note}" for note in notes)
+
+# 🔹 Registered model versions; activating one takes effect on the next prediction
+def render_model_registry():
+    st.subheader("🗂️ Model Versions")
+    registry = ModelRegistry()
+    versions = registry.list_versions()
+
+    if versions:
+        st.dataframe([{
+            "Version": v["version"],
+            "Active": "✅" if v["active"] else "",
+            "Registered": v["registered_at"],
+            "Binary F1": v["metrics"].get("Binary F1 Score"),
+            "Sequence F1": v["metrics"].get("Sequence F1 Score"),
+            "Eval split": v["metrics"].get("Evaluation Split", {}).get("split", "unknown"),
+            "Source": v["source"],
+        } for v in versions], use_container_width=True)
+
+        names = [v["version"] for v in versions]
+        active = registry.active_version()
+        selected = st.selectbox("Active version", names, index=names.index(active) if active in names else 0)
+        if st.button("Activate", disabled=selected == active):
+            registry.activate(selected)
+            st.success(f"✅ {selected} is now active. Predictions already running finish on {active}.")
+    else:
+        st.info("No model versions registered yet; predictions use stutter_model_full.pt.")
+
+    with st.expander("➕ Register a checkpoint"):
+        checkpoint = st.text_input("Checkpoint path", value="stutter_model_full.pt")
+        version = st.text_input("Version name (optional)")
+        attach_metrics = st.checkbox("Attach metrics from model_metrics.json", value=True)
+        activate = st.checkbox("Activate after registering")
+        if st.button("Register"):
+            try:
+                metrics = {}
+                if attach_metrics:
+                    with open("model_metrics.json", "r") as f:
+                        metrics = json.load(f)
+                name = registry.register(checkpoint, version.strip() or None, metrics, activate)
+                st.success(f"✅ Registered {name}")
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Registration failed: {e}")
+
+# 🔹 Which windows the metrics were computed on
+def describe_split(split):
+    if not split:
+        return "Evaluation split not recorded — these metrics may include training windows."
+    if split["split"] == "valid":
+        return (f"Evaluated on held-out recordings: {split['recordings']} recordings / {split['windows']} windows "
+                f"({split['valid_pct']:.0%} split by recording, seed {split['seed']}).")
+    return (f"Evaluated on every window in the store ({split['recordings']} recordings / {split['windows']} windows), "
+            "including training data.")
 
 def render():
     st.title("🧠 Stuttering Detection Model Evaluation Dashboard")
 
+    render_model_registry()
+
     # 🔹 Load metrics
     try:
         with open("model_metrics.json", "r") as f:
@@ -23,7 +116,13 @@ def render():
 
     st.subheader("📌 Sequence-Level Metrics")
     st.metric("Sequence F1 Score", metrics["Sequence F1 Score"])
-    st.write(f"Training Epochs: {metrics['Training Epochs']}")
+    if metrics.get("Training Epochs") is not None:
+        st.write(f"Training Epochs: {metrics['Training Epochs']}")
+    st.caption(describe_split(metrics.get("Evaluation Split")))
+    throughput = metrics.get("Evaluation Throughput")
+    if throughput:
+        st.caption(f"Evaluated {throughput['windows']} windows in {throughput['seconds']}s "
+                   f"({throughput['windows_per_sec']} windows/s)")
 
     # 🔹 Class-wise F1 Scores
     st.subheader("📊 Class-wise F1 Scores")
@@ -55,13 +154,35 @@ def render():
 
     st.pyplot(fig2)
 
+    # 🔹 Pipeline Latency
+    st.subheader("⏱️ Prediction Pipeline Latency (last 7 days)")
+    spans = load_spans()
+    if spans.empty:
+        st.info("No traced predictions yet.")
+    else:
+        st.dataframe(stage_percentiles(spans), use_container_width=True)
+
+        stages = stage_percentiles(spans).index.tolist()
+        n_cols = 2
+        n_rows = (len(stages) + n_cols - 1) // n_cols
+        fig3, axes = plt.subplots(n_rows, n_cols, figsize=(10, 3 * n_rows), squeeze=False)
+        for ax, stage in zip(axes.flat, stages):
+            durations = spans.loc[spans["stage"] == stage, "duration_ms"]
+            ax.hist(durations, bins=30, color="mediumpurple")
+            ax.axvline(durations.quantile(0.5), color="black", linestyle="--", label="p50")
+            ax.axvline(durations.quantile(0.99), color="tomato", linestyle="--", label="p99")
+            ax.set_title(stage)
+            ax.set_xlabel("ms")
+            ax.legend(fontsize=8)
+        for ax in list(axes.flat)[len(stages):]:
+            ax.set_visible(False)
+        fig3.tight_layout()
+
+        st.pyplot(fig3)
+
     # 🔹 Interpretation
     st.subheader("🧠 Quick Interpretation")
-    st.markdown("""
-    - **High Binary Recall (0.988)**: Model rarely misses stuttered windows.
-    - **Lower WordRep F1 (0.234)**: May need more training data or better feature separation.
-    - **Loss curve** shows some spikes — consider smoothing or early stopping.
-    """)
+    st.markdown(interpret_metrics(metrics))
 
 # 🔹 Run the dashboard
 if __name__ == "__main__":
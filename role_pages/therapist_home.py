@@ -1,174 +1,301 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import streamlit as st
 import torch
-import numpy as np
-import librosa
-from pydub import AudioSegment
-import os
 import whisper
-from fpdf import FPDF
 
-from model import CNN_BiGRU_StutterTiming  # Your trained model class
+from pipeline.inference import preprocess_audio, load_full_features, predict_windowed
+from pipeline.audio import SAMPLE_RATE, decode_audio
+from pipeline.backends import load_backend
+from pipeline import client
+from pipeline.tracing import span, record, new_trace_id
+from pipeline.vad import apply_vad
+from pipeline.transcription import LONG_FORM_SECONDS, TRANSCRIBE_OPTIONS, WORKERS, LongFormTranscriber
+from storage.feature_cache import FeatureCache
+from storage.transcript_cache import TranscriptCache
+from storage.model_registry import ModelRegistry
+from storage.upload_store import UploadStore
+from pipeline.events import TYPE_NAMES, count_types, extract_events, summarize_events
+from pipeline.alignment import align_events
+from pipeline.report import build_session_report
 
-# 🔹 Constants
-WINDOW_SIZE = 64
-FRAME_DURATION = 0.02
-THRESHOLD = 0.5
-TYPE_NAMES = ["Prolongation", "Block", "SoundRep", "WordRep", "Interjection"]
+WHISPER_MODEL = "base"
 
-# 🔹 Load model
+# 🔹 Load model (engine chosen by INFERENCE_BACKEND: torch / torchscript / onnx)
 @st.cache_resource
 def load_model():
-    model = CNN_BiGRU_StutterTiming(sample_shape=(3, 64, WINDOW_SIZE))
-    state_dict = torch.load("stutter_model_full.pt", map_location=torch.device('cpu'))
-    model.load_state_dict(state_dict)
-    model.eval()
-    return model
+    return load_backend()
+
+# 🔹 Model registry: when versions are registered, the active one is used and can be switched at runtime
+@st.cache_resource
+def load_registry():
+    return ModelRegistry()
 
-model = load_model()
+def get_active_model():
+    registry = load_registry()
+    if registry.active_version() is None:
+        return None, load_model()
+    return registry.get_model()
 
 # 🔹 Load Whisper
 @st.cache_resource
 def load_whisper():
-    return whisper.load_model("base")
-
-whisper_model = load_whisper()
-
-# 🔹 Save uploaded file
-def save_uploaded_file(uploaded_file, temp_dir="temp_audio"):
-    os.makedirs(temp_dir, exist_ok=True)
-    file_path = os.path.join(temp_dir, uploaded_file.name)
-    with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
-    return file_path
-
-# 🔹 Convert to WAV if needed
-def convert_to_wav(file_path):
-    if file_path.lower().endswith(".wav"):
-        return file_path
-    audio = AudioSegment.from_file(file_path)
-    wav_path = os.path.splitext(file_path)[0] + ".wav"
-    audio.export(wav_path, format="wav")
-    return wav_path
-
-# 🔹 Preprocess audio for model
-def preprocess_audio(file_path, sr=16000, n_mels=64, max_len=128):
-    y, _ = librosa.load(file_path, sr=sr)
-    S = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=n_mels)
-    S_db = librosa.power_to_db(S, ref=np.max)
-
-    if S_db.shape[1] < max_len:
-        S_db = np.pad(S_db, ((0, 0), (0, max_len - S_db.shape[1])), mode='constant')
-    else:
-        S_db = S_db[:, :max_len]
-
-    delta = librosa.feature.delta(S_db)
-    delta2 = librosa.feature.delta(S_db, order=2)
-
-    for arr in [S_db, delta, delta2]:
-        arr -= np.mean(arr)
-        arr /= np.std(arr)
-
-    stacked = np.stack([S_db, delta, delta2], axis=0)
-    return torch.tensor(stacked, dtype=torch.float32).unsqueeze(0)
-
-# 🔹 Group stutter events
-def group_stutter_events(seq_probs, threshold=THRESHOLD, frame_duration=FRAME_DURATION):
-    seq_probs = seq_probs.T
-    events = []
-    type_counts = [0] * len(TYPE_NAMES)
-
-    for type_idx, st_type in enumerate(TYPE_NAMES):
-        active = False
-        start_frame = None
-        for t in range(seq_probs.shape[1]):
-            prob = seq_probs[type_idx, t]
-            if prob > threshold:
-                if not active:
-                    active = True
-                    start_frame = t
-            else:
-                if active:
-                    end_frame = t
-                    start = round(start_frame * frame_duration, 2)
-                    end = round(end_frame * frame_duration, 2)
-                    events.append((st_type, start, end))
-                    type_counts[type_idx] += 1
-                    active = False
-        if active:
-            end_frame = seq_probs.shape[1]
-            start = round(start_frame * frame_duration, 2)
-            end = round(end_frame * frame_duration, 2)
-            events.append((st_type, start, end))
-            type_counts[type_idx] += 1
-
-    return events, dict(zip(TYPE_NAMES, type_counts))
+    return whisper.load_model(WHISPER_MODEL)
+
+# 🔹 Whisper worker processes for long recordings (WHISPER_WORKERS, WHISPER_CHUNK_SECONDS)
+@st.cache_resource
+def load_long_form_transcriber():
+    return LongFormTranscriber(WHISPER_MODEL)
+
+# 🔹 Feature cache (shared across sessions)
+@st.cache_resource
+def load_feature_cache():
+    return FeatureCache()
+
+feature_cache = load_feature_cache()
+
+# 🔹 Transcript cache and the executor that runs ASR next to stutter inference
+@st.cache_resource
+def load_transcript_cache():
+    return TranscriptCache()
+
+transcript_cache = load_transcript_cache()
+
+# 🔹 Original uploads: deduplicated by content, namespaced per user, swept against a disk quota
+@st.cache_resource
+def load_upload_store():
+    store = UploadStore()
+    store.start_sweeper()
+    return store
+
+upload_store = load_upload_store()
+
+@st.cache_resource
+def load_executor():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="analysis")
+
+executor = load_executor()
 
 # 🔹 Transcribe audio
-def transcribe_audio(wav_path):
-    result = whisper_model.transcribe(wav_path)
+def transcribe_audio(audio, whisper_model, long_form=None):
+    # Long recordings are split at silences and transcribed in parallel; same (text, segments) output
+    if long_form is not None and not isinstance(audio, str) and len(audio) > LONG_FORM_SECONDS * SAMPLE_RATE:
+        return long_form.transcribe(audio)
+    result = whisper_model.transcribe(audio, **TRANSCRIBE_OPTIONS)
     return result["text"], result["segments"]
 
-# 🔹 Export transcript to PDF
-def export_transcript_to_pdf(transcript_text, filename="transcript.pdf"):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    for line in transcript_text.split("\n"):
-        pdf.multi_cell(0, 10, line)
-    pdf.output(filename)
-    return filename
+# 🔹 Transcription stage (skips ASR when this recording was transcribed before)
+def run_transcription(y, audio_bytes, audio_hash, trace_id=None, voiced_map=None, whisper_model=None, long_form=None):
+    if client.server_url():
+        with span("transcribe_remote", trace_id):
+            return client.transcribe(audio_bytes)
+
+    # "+words": entries cached before word timestamps were requested have no words to align
+    key = transcript_cache.make_key(audio_hash, WHISPER_MODEL + "+words" + ("+vad" if voiced_map else ""))
+    cached = transcript_cache.get(key)
+    if cached is not None:
+        return cached
+    with span("transcribe", trace_id):
+        transcript_text, segments = transcribe_audio(y, whisper_model, long_form)
+    if voiced_map is not None:
+        segments = voiced_map.remap_segments(segments)
+    transcript_cache.put(key, transcript_text, segments)
+    return transcript_text, segments
+
+# 🔹 Stutter detection stage
+def run_detection(y, audio_bytes, full_length, trace_id=None, active_model=None):
+    if client.server_url():
+        with span("detect_remote", trace_id):
+            return client.detect(audio_bytes, full_length)
+
+    # Held for the whole prediction, so a version switch mid-way doesn't affect it
+    version, model = active_model
+    stats = {"model_version": version}
+    if full_length:
+        with span("preprocess", trace_id):
+            features = load_full_features(y, cache=feature_cache)
+        with span("forward", trace_id):
+            window_probs, seq_probs, window_stats = predict_windowed(model, features)
+        stats.update(window_stats)
+        bin_prob = float(window_probs.max())
+    else:
+        with span("preprocess", trace_id):
+            x = preprocess_audio(y, cache=feature_cache)
+        with span("forward", trace_id), torch.no_grad():
+            bin_pred, seq_pred = model(x)
+            bin_prob = torch.sigmoid(bin_pred).item()
+            seq_probs = torch.sigmoid(seq_pred).squeeze(0).numpy()
+    return bin_prob, seq_probs, stats
+
+# 🔹 Session report PDF, rendered in memory once per analysis (audio, model version, mode)
+# The "pdf" span is recorded here, so cache hits on later reruns add nothing to the trace
+@st.cache_data(max_entries=64, show_spinner=False)
+def session_report_pdf(audio_hash, model_version, full_length, skip_silence, _transcript_text, _bin_prob, _type_counts, _alignment,
+                       _trace_id=None):
+    with span("pdf", _trace_id):
+        return build_session_report(_transcript_text, _bin_prob, _type_counts, _alignment, model_version)
+
+# 🔹 Events, counts and the report for the last analysis (re-drawn on every rerun)
+def render_analysis(analysis, show_summary=True):
+    if show_summary:
+        st.subheader("📝 Transcript")
+        st.text_area("Full Transcript", analysis["transcript_text"], height=200)
+        if analysis["model_version"]:
+            st.caption(f"🧩 Model version: {analysis['model_version']}")
+        st.subheader("Prediction Result")
+        show_prediction(analysis["bin_prob"])
+
+    st.subheader("📍 Detected Stutter Events with Transcript")
+    alignment = analysis["alignment"]
+    if alignment is not None:
+        for row in alignment.itertuples(index=False):
+            st.write(f"🕒 {row.start:.2f}s – {row.end:.2f}s → {row.type}")
+            if row.words:
+                st.markdown(f"> 🗣️ {row.words}")
+            elif row.text:
+                st.markdown(f"> {row.text}")
+        with st.expander("Alignment table"):
+            st.dataframe(alignment, use_container_width=True)
+    else:
+        st.write("⚠️ Stuttering detected, but no confident events found.")
+
+    st.subheader("📊 Total Stutter Type Counts")
+    for t in TYPE_NAMES:
+        st.write(f"{t}: {analysis['type_counts'][t]}")
+
+    # 🔹 PDF Download (built in memory, nothing written to the working directory; cached per analysis)
+    report = session_report_pdf(analysis["audio_hash"], analysis["model_version"], analysis["full_length"],
+                                analysis["skip_silence"], analysis["transcript_text"], analysis["bin_prob"],
+                                analysis["type_counts"], alignment, analysis["trace_id"])
+    st.download_button("📄 Download Session Report (PDF)", report,
+                       file_name=f"session_report_{analysis['audio_hash'][:8]}.pdf", mime="application/pdf",
+                       on_click="ignore")
+
+def show_prediction(bin_prob):
+    if bin_prob > 0.5:
+        st.success(f"🧠 Stutter Detected\n\nBinary stutter probability: {bin_prob:.3f}")
+    else:
+        st.info(f"✅ No Stutter Detected\n\nBinary stutter probability: {bin_prob:.3f}")
 
 # 🔹 Streamlit UI
 def render():
     st.title("Stuttering Detection and Transcript Generator")
     uploaded_file = st.file_uploader("Upload an audio file (.wav, .mp3, .m4a)", type=["wav", "mp3", "m4a"])
+    full_length = st.checkbox("Analyze full recording (sliding windows)", value=True)
+    skip_silence = st.checkbox("Skip silence (voice activity detection)", value=False,
+                               help="Faster on long recordings with gaps; pauses of 2 s or more are shortened")
 
+    predicted = False
     if st.button("Predict", type="primary") and uploaded_file:
         try:
-            raw_path = save_uploaded_file(uploaded_file)
-            wav_path = convert_to_wav(raw_path)
-
-            # 🔹 Transcription
-            transcript_text, segments = transcribe_audio(wav_path)
-            st.subheader("📝 Transcript")
-            st.text_area("Full Transcript", transcript_text, height=200)
-
-            # 🔹 PDF Download
-            pdf_path = export_transcript_to_pdf(transcript_text)
-            with open(pdf_path, "rb") as f:
-                st.download_button("Download Transcript as PDF", f, file_name="transcript.pdf")
-
-            # 🔹 Stutter Prediction
-            x = preprocess_audio(wav_path)
-            with torch.no_grad():
-                bin_pred, seq_pred = model(x)
-                bin_prob = torch.sigmoid(bin_pred).item()
-                seq_probs = torch.sigmoid(seq_pred).squeeze(0).numpy()
-
-            st.subheader("Prediction Result")
-            if bin_prob > 0.5:
-                st.success(f"🧠 Stutter Detected\n\nBinary stutter probability: {bin_prob:.3f}")
-            else:
-                st.info(f"✅ No Stutter Detected\n\nBinary stutter probability: {bin_prob:.3f}")
-
-            st.subheader("📍 Detected Stutter Events with Transcript")
-            events, type_counts = group_stutter_events(seq_probs)
+            trace_id = new_trace_id()
+            started_at, t0 = time.time(), time.perf_counter()
+            audio_bytes = uploaded_file.getvalue()
+            audio_hash = hashlib.sha256(audio_bytes).hexdigest()
+            with span("store", trace_id):
+                upload_store.put(st.session_state.get("user_email"), audio_bytes, uploaded_file.name, digest=audio_hash)
+
+            # 🔹 Decode once in memory; shared by Whisper and the stutter model
+            # (with INFERENCE_SERVER_URL set the server decodes and this page is a thin client)
+            y = None
+            if not client.server_url():
+                with span("decode", trace_id):
+                    y = decode_audio(audio_bytes)
+
+            # 🔹 Only voiced regions go through Whisper and the stutter model; timestamps are mapped back
+            voiced_map = None
+            if y is not None and skip_silence:
+                with span("vad", trace_id):
+                    y, voiced_map = apply_vad(y)
+                st.caption(f"🔇 Skipped {voiced_map.skipped_fraction:.0%} of the recording as silence "
+                           f"({(voiced_map.total_samples - voiced_map.voiced_samples) / SAMPLE_RATE:.1f}s)")
+
+            # 🔹 st.cache_resource needs the script thread's context: resolve models here, pass them to the workers
+            whisper_model = long_form = active_model = None
+            if y is not None:
+                whisper_model = load_whisper()
+                if WORKERS > 1 and len(y) > LONG_FORM_SECONDS * SAMPLE_RATE:
+                    long_form = load_long_form_transcriber()
+                active_model = get_active_model()
+
+            # 🔹 Placeholders keep the page layout stable whichever stage finishes first
+            transcript_area = st.container()
+            prediction_area = st.container()
+
+            futures = {
+                executor.submit(run_transcription, y, audio_bytes, audio_hash, trace_id, voiced_map,
+                                whisper_model, long_form): "transcript",
+                executor.submit(run_detection, y, audio_bytes, full_length, trace_id, active_model): "detection",
+            }
+            results = {}
+            for future in as_completed(futures):
+                stage = futures[future]
+                results[stage] = future.result()
+
+                if stage == "transcript":
+                    transcript_text, segments = results[stage]
+                    with transcript_area:
+                        st.subheader("📝 Transcript")
+                        st.text_area("Full Transcript", transcript_text, height=200)
+                else:
+                    bin_prob, seq_probs, stats = results[stage]
+                    with prediction_area:
+                        if stats and stats.get("model_version"):
+                            st.caption(f"🧩 Model version: {stats['model_version']}")
+                        if stats and "windows" in stats:
+                            st.caption(f"⚡ {stats['windows']} windows in {stats['seconds']:.2f}s "
+                                       f"({stats['windows_per_sec']:.1f} windows/s on CPU)")
+                        if not client.server_url():
+                            cache_stats = feature_cache.stats()
+                            st.caption(f"🗄️ Feature cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                                       f"({cache_stats['entries']} entries, {cache_stats['bytes'] / 1e6:.1f} MB)")
+                        store_stats = upload_store.stats()
+                        st.caption(f"📦 Upload store: {store_stats['blobs']} files, {store_stats['bytes'] / 1e6:.1f} MB "
+                                   f"({store_stats['occupancy']:.0%} of quota) · {store_stats['dedupe_hits']} deduplicated · "
+                                   f"{store_stats['evictions']} evicted")
+
+                        st.subheader("Prediction Result")
+                        show_prediction(bin_prob)
+
+            transcript_text, segments = results["transcript"]
+            bin_prob, seq_probs, stats = results["detection"]
+
+            with span("grouping", trace_id):
+                events, type_counts = summarize_events(extract_events(seq_probs))
+                if voiced_map is not None:
+                    # Remapping splits events that cross a splice: count the rows that are shown
+                    events = voiced_map.remap_events(events)
+                    type_counts = count_types(events)
+            alignment = None
             if events:
-                for st_type, start, end in events:
-                    st.write(f"🕒 {start:.2f}s – {end:.2f}s → {st_type}")
-                    matching_lines = [seg["text"] for seg in segments if seg["start"] >= start and seg["end"] <= end]
-                    for line in matching_lines:
-                        st.markdown(f"> {line}")
-            else:
-                st.write("⚠️ Stuttering detected, but no confident events found.")
-
-            st.subheader("📊 Total Stutter Type Counts")
-            for t in TYPE_NAMES:
-                st.write(f"{t}: {type_counts[t]}")
+                with span("alignment", trace_id):
+                    alignment = align_events(events, segments)
+
+            # 🔹 Kept across reruns (e.g. the download click) so results stay on the page
+            st.session_state["analysis"] = {
+                "trace_id": trace_id,
+                "audio_hash": audio_hash,
+                "model_version": stats.get("model_version") if stats else None,
+                "full_length": full_length,
+                "skip_silence": skip_silence,
+                "transcript_text": transcript_text,
+                "bin_prob": bin_prob,
+                "type_counts": type_counts,
+                "alignment": alignment,
+            }
+            predicted = True
+            record(trace_id, "total", started_at, (time.perf_counter() - t0) * 1e3)
 
         except Exception as e:
+            st.session_state.pop("analysis", None)
             st.error(f"❌ Error during prediction: {e}")
 
+    analysis = st.session_state.get("analysis")
+    if analysis is not None:
+        render_analysis(analysis, show_summary=not predicted)
+
 # 🔹 Run the app
 if __name__ == "__main__":
     render()
@@ -0,0 +1,45 @@
+import hashlib
+
+import numpy as np
+
+from storage.lru_cache import LRUFileCache
+
+CACHE_DIR = "feature_cache"
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+
+class FeatureCache(LRUFileCache):
+    """Content-addressed .npy cache for mel/delta feature stacks.
+
+    Entries are keyed by the SHA-256 of the audio bytes plus the feature
+    parameters, loaded with mmap, and evicted least-recently-used once the
+    directory grows past max_bytes.
+    """
+
+    SUFFIX = ".npy"
+    LOAD_ERRORS = (FileNotFoundError, ValueError)
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def make_key(audio_bytes, **params):
+        h = hashlib.sha256(audio_bytes)
+        for name in sorted(params):
+            h.update(f"|{name}={params[name]}".encode())
+        return h.hexdigest()
+
+    def _load(self, path):
+        return np.load(path, mmap_mode="r")
+
+    def _dump(self, path, array):
+        with open(path, "wb") as f:
+            np.save(f, np.asarray(array, dtype=np.float32))
+
+    def get_or_compute(self, audio_bytes, compute, **params):
+        key = self.make_key(audio_bytes, **params)
+        array = self.get(key)
+        if array is None:
+            array = np.asarray(compute(), dtype=np.float32)
+            self.put(key, array)
+        return array
@@ -0,0 +1,87 @@
+import os
+import threading
+
+
+class LRUFileCache:
+    """Content-addressed files in one directory, evicted least-recently-used.
+
+    Subclasses set SUFFIX and LOAD_ERRORS and implement _load / _dump for
+    their file format. get() touches the file's mtime, and put() evicts the
+    oldest entries once the directory grows past max_bytes.
+    """
+
+    SUFFIX = ""
+    LOAD_ERRORS = (FileNotFoundError,)
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}{self.SUFFIX}")
+
+    def _load(self, path):
+        raise NotImplementedError
+
+    def _dump(self, path, value):
+        raise NotImplementedError
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            value = self._load(path)
+            os.utime(path)  # mark as recently used
+        except self.LOAD_ERRORS:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._dump(tmp_path, value)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(self.SUFFIX):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self):
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
@@ -0,0 +1,149 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from pipeline.backends import EXPORTERS, backend_kind, load_backend
+from pipeline.inference import load_model
+
+REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "model_registry")
+REGISTRY_FILE = "registry.json"
+LOCK_FILE = "registry.lock"
+ARTIFACT_SUFFIXES = {"torch": ".pt", "torchscript": ".ts.pt", "onnx": ".onnx"}
+VERSION_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+class ModelRegistry:
+    """Versioned checkpoints with an active version that can change at runtime.
+
+    registry.json is the shared source of truth, so every process sees an
+    activation on its next prediction. get_model() hands out a reference to
+    the loaded module; a prediction that already holds the old version keeps
+    using it until it finishes, and the old weights are freed afterwards.
+
+    Models are served through pipeline.backends, so INFERENCE_BACKEND still
+    applies: TorchScript / ONNX artifacts are exported from a version's
+    checkpoint the first time that backend asks for it.
+
+    Pages build a new ModelRegistry per render and the server runs in its own
+    process, so register() / activate() hold a file lock around the
+    read-modify-write of registry.json, not just an in-process one.
+    """
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+        self._models = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, "versions"), exist_ok=True)
+
+    def _read(self):
+        try:
+            with open(os.path.join(self.root, REGISTRY_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"active": None, "versions": {}}
+
+    @contextmanager
+    def _locked(self):
+        with open(os.path.join(self.root, LOCK_FILE), "a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _write(self, data):
+        path = os.path.join(self.root, REGISTRY_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def list_versions(self):
+        data = self._read()
+        return [dict(entry, version=version, active=version == data["active"])
+                for version, entry in data["versions"].items()]
+
+    def active_version(self):
+        return self._read()["active"]
+
+    def register(self, checkpoint_path, version=None, metrics=None, activate=False):
+        with self._locked():
+            data = self._read()
+            version = version or f"v{len(data['versions']) + 1}"
+            # Version names become file names under versions/
+            if not VERSION_PATTERN.fullmatch(version) or ".." in version:
+                raise ValueError(f"Invalid model version name {version!r}: use letters, digits, '.', '_' or '-'")
+            if version in data["versions"]:
+                raise ValueError(f"Model version {version!r} is already registered")
+
+            target = os.path.join(self.root, "versions", f"{version}.pt")
+            shutil.copy2(checkpoint_path, target)
+            data["versions"][version] = {
+                "path": target,
+                "source": os.path.abspath(checkpoint_path),
+                "registered_at": datetime.now().isoformat(timespec="seconds"),
+                "metrics": metrics or {},
+            }
+            if activate or data["active"] is None:
+                data["active"] = version
+            self._write(data)
+        return version
+
+    def activate(self, version):
+        with self._locked():
+            data = self._read()
+            if version not in data["versions"]:
+                raise KeyError(f"Unknown model version {version!r}")
+            data["active"] = version
+            self._write(data)
+
+    def _artifact(self, entry, version, kind):
+        if kind == "torch":
+            return entry["path"]
+        name = f"{version}{ARTIFACT_SUFFIXES[kind]}"
+        path = os.path.join(self.root, "versions", name)
+        if not os.path.exists(path):
+            # Export under the final name in a scratch dir, then move every file it wrote
+            # (the ONNX exporter may add an external-data file that refers to it by name)
+            tmp_dir = tempfile.mkdtemp(dir=os.path.join(self.root, "versions"), prefix=".export-")
+            try:
+                EXPORTERS[kind](load_model(entry["path"]), os.path.join(tmp_dir, name))
+                for f in sorted(os.listdir(tmp_dir), key=lambda f: f == name):
+                    os.replace(os.path.join(tmp_dir, f), os.path.join(self.root, "versions", f))
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        return path
+
+    def get_model(self, version=None, kind=None):
+        """(version, model) for the requested or currently active version on the configured backend."""
+        data = self._read()
+        version = version or data["active"]
+        if version is None:
+            raise LookupError("No model version registered")
+        kind = backend_kind(kind)
+        with self._lock:
+            model = self._models.get((version, kind))
+            if model is None:
+                model = load_backend(kind, self._artifact(data["versions"][version], version, kind))
+                # Drop our reference to other versions; in-flight predictions keep theirs
+                self._models = {(version, kind): model}
+            return version, model
@@ -0,0 +1,37 @@
+import hashlib
+import json
+
+from storage.lru_cache import LRUFileCache
+
+CACHE_DIR = "transcript_cache"
+MAX_CACHE_BYTES = 256 * 1024 ** 2
+
+
+class TranscriptCache(LRUFileCache):
+    """Whisper results stored as JSON, keyed by audio hash and Whisper model name.
+
+    Entries are evicted least-recently-used once the directory grows past max_bytes.
+    """
+
+    SUFFIX = ".json"
+    LOAD_ERRORS = (FileNotFoundError, json.JSONDecodeError)
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    @staticmethod
+    def make_key(audio_hash, model_name):
+        return hashlib.sha256(f"{audio_hash}|{model_name}".encode()).hexdigest()
+
+    def _load(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        return entry["text"], entry["segments"]
+
+    def _dump(self, path, entry):
+        text, segments = entry
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"text": text, "segments": segments}, f, default=float)
+
+    def put(self, key, text, segments):
+        super().put(key, (text, segments))
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+STORE_DIR = "upload_store"
+MAX_STORE_BYTES = 5 * 1024 ** 3
+MAX_AGE_SECONDS = 30 * 24 * 3600
+SWEEP_INTERVAL_SECONDS = 600
+
+
+class UploadStore:
+    """Content-addressed store for original audio uploads.
+
+    Each distinct upload is written once to blobs/<sha256><ext>, however many
+    users upload it. Per-user references live under refs/<user namespace>/, so
+    identical file names from different users never collide. Blobs count as
+    used when they are stored or read. They are evicted when older than
+    max_age or, least-recently-used first, once the store grows past
+    max_bytes. A background sweeper can apply the same policy periodically.
+    """
+
+    def __init__(self, root=STORE_DIR, max_bytes=MAX_STORE_BYTES, max_age=MAX_AGE_SECONDS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.blob_dir = os.path.join(root, "blobs")
+        self.ref_dir = os.path.join(root, "refs")
+        self.puts = 0
+        self.dedupe_hits = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.last_sweep = None
+        self._lock = threading.Lock()
+        self._sweeper = None
+        self._stop = threading.Event()
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.ref_dir, exist_ok=True)
+
+    @staticmethod
+    def namespace(user):
+        return hashlib.sha256((user or "anonymous").encode()).hexdigest()[:16]
+
+    def _blob_path(self, digest, ext):
+        return os.path.join(self.blob_dir, f"{digest}{ext}")
+
+    def put(self, user, data, filename, digest=None):
+        """Store an upload for a user → (digest, blob path, deduplicated)."""
+        digest = digest or hashlib.sha256(data).hexdigest()
+        ext = os.path.splitext(filename)[1].lower()
+        path = self._blob_path(digest, ext)
+
+        with self._lock:
+            self.puts += 1
+            deduped = os.path.exists(path)
+            if deduped:
+                self.dedupe_hits += 1
+                os.utime(path)  # mark as recently used
+            else:
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+
+            user_dir = os.path.join(self.ref_dir, self.namespace(user))
+            os.makedirs(user_dir, exist_ok=True)
+            with open(os.path.join(user_dir, f"{digest}.json"), "w", encoding="utf-8") as f:
+                json.dump({"name": filename, "blob": os.path.basename(path),
+                           "size": len(data), "uploaded_at": time.time()}, f)
+
+        self._evict_over_quota()
+        return digest, path, deduped
+
+    def get(self, user, digest):
+        """Bytes of an upload the user owns, or None if unknown or evicted."""
+        ref_path = os.path.join(self.ref_dir, self.namespace(user), f"{digest}.json")
+        try:
+            with open(ref_path, "r", encoding="utf-8") as f:
+                ref = json.load(f)
+            path = os.path.join(self.blob_dir, ref["blob"])
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return data
+
+    def list_uploads(self, user):
+        user_dir = os.path.join(self.ref_dir, self.namespace(user))
+        uploads = []
+        if not os.path.isdir(user_dir):
+            return uploads
+        for name in os.listdir(user_dir):
+            try:
+                with open(os.path.join(user_dir, name), "r", encoding="utf-8") as f:
+                    ref = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            if os.path.exists(os.path.join(self.blob_dir, ref["blob"])):
+                uploads.append({"digest": name[:-len(".json")], **ref})
+        return sorted(uploads, key=lambda r: r["uploaded_at"], reverse=True)
+
+    def _blobs(self):
+        blobs = []
+        with os.scandir(self.blob_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".tmp"):
+                    st = entry.stat()
+                    blobs.append((st.st_mtime, st.st_size, entry.path))
+        return blobs
+
+    def _remove(self, path, size):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self.evictions += 1
+        self.evicted_bytes += size
+
+    def _evict_over_quota(self):
+        with self._lock:
+            blobs = self._blobs()
+            total = sum(size for _, size, _ in blobs)
+            for _, size, path in sorted(blobs):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path, size)
+                total -= size
+
+    def _prune_refs(self):
+        live = set(os.listdir(self.blob_dir))
+        for user_dir in os.scandir(self.ref_dir):
+            if not user_dir.is_dir():
+                continue
+            for ref in os.scandir(user_dir.path):
+                try:
+                    with open(ref.path, "r", encoding="utf-8") as f:
+                        blob = json.load(f)["blob"]
+                except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                    blob = None
+                if blob not in live:
+                    try:
+                        os.remove(ref.path)
+                    except FileNotFoundError:
+                        pass
+
+    def sweep(self):
+        """Drop blobs past max_age, enforce the quota, then drop references to evicted blobs."""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            for mtime, size, path in self._blobs():
+                if mtime < cutoff:
+                    self._remove(path, size)
+        self._evict_over_quota()
+        with self._lock:
+            self._prune_refs()
+            self.last_sweep = time.time()
+
+    def start_sweeper(self, interval=SWEEP_INTERVAL_SECONDS):
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.sweep()
+                except OSError:
+                    pass
+
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=loop, name="upload-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop.set()
+
+    def stats(self):
+        blobs = self._blobs()
+        total = sum(size for _, size, _ in blobs)
+        users = [d for d in os.scandir(self.ref_dir) if d.is_dir()]
+        return {
+            "blobs": len(blobs),
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "occupancy": total / self.max_bytes if self.max_bytes else 0.0,
+            "users": len(users),
+            "puts": self.puts,
+            "dedupe_hits": self.dedupe_hits,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
+            "last_sweep": self.last_sweep,
+        }
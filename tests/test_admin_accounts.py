@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from config.db_config import escape_like
+from role_pages import admin_accounts
+
+ROWS = [(1, "b", 3), (2, "a", None), (3, "c", 1), (4, "a", 3), (5, "b", None),
+        (6, "100%_done", 3), (7, "a", 1), (8, None, 2), (9, "c", None), (10, "100 done", 2)]
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'accounts.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, score INTEGER)"))
+        conn.execute(text("INSERT INTO users VALUES (:id, :name, :score)"),
+                     [{"id": i, "name": n, "score": s} for i, n, s in ROWS])
+    monkeypatch.setattr(admin_accounts, "get_engine", lambda: engine)
+    admin_accounts.reflect_table.clear()
+    admin_accounts.fetch_page.clear()
+    yield engine
+    admin_accounts.reflect_table.clear()
+    admin_accounts.fetch_page.clear()
+
+
+def all_pages(sort_col, descending, page_size, filters=()):
+    ids, cursor = [], None
+    while True:
+        df, cursor = admin_accounts.fetch_page("users", tuple(filters), sort_col, descending, cursor, page_size)
+        assert len(df) <= page_size
+        ids.extend(df["id"].tolist())
+        if cursor is None:
+            return ids
+
+
+def expected_order(sort_col, descending):
+    col = {"id": 0, "name": 1, "score": 2}[sort_col]
+    present = [r for r in ROWS if r[col] is not None]
+    ordered = sorted(present, key=lambda r: (r[col], r[0]), reverse=descending)
+    nulls = sorted((r for r in ROWS if r[col] is None), key=lambda r: r[0], reverse=descending)
+    return [r[0] for r in ordered + nulls]
+
+
+@pytest.mark.parametrize("sort_col", ["id", "name", "score"])
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("page_size", [1, 2, 3, 4, 10, 25])
+def test_keyset_pages_visit_every_row_once(engine, sort_col, descending, page_size):
+    ids = all_pages(sort_col, descending, page_size)
+    assert ids == expected_order(sort_col, descending)
+
+
+def test_filters_match_literally(engine):
+    assert all_pages("id", False, 2, [("name", "100%")]) == [6]
+    assert all_pages("id", False, 2, [("name", "_")]) == [6]
+    assert all_pages("id", False, 2, [("score", "3")]) == [1, 4, 6]
+
+
+def test_escape_like():
+    assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+    assert escape_like("plain") == "plain"
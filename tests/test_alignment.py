@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from pipeline.alignment import ALIGNMENT_COLUMNS, IntervalIndex, align_events
+
+
+def brute_force(intervals, start, end):
+    return sorted((s, e, p) for s, e, p in intervals if s < end and e > start)
+
+
+def test_interval_index_matches_brute_force():
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(0, 100, 300)
+    # Mixed lengths, so long intervals overlap many later ones
+    intervals = [(float(s), float(s + d), i) for i, (s, d) in enumerate(zip(starts, rng.exponential(2, 300)))]
+    index = IntervalIndex(intervals)
+    for start in rng.uniform(-5, 105, 200):
+        end = start + rng.uniform(0, 10)
+        assert sorted(index.overlapping(start, end)) == brute_force(intervals, start, end)
+
+
+def test_touching_intervals_do_not_overlap():
+    index = IntervalIndex([(0.0, 1.0, "a"), (1.0, 2.0, "b")])
+    assert [p for _, _, p in index.overlapping(1.0, 1.5)] == ["b"]
+    assert [p for _, _, p in index.overlapping(0.5, 1.0)] == ["a"]
+
+
+def test_empty_index():
+    index = IntervalIndex([])
+    assert len(index) == 0
+    assert index.overlapping(0, 10) == []
+
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.0, "text": " Hello there.",
+     "words": [{"word": " Hello", "start": 0.0, "end": 0.8}, {"word": " there.", "start": 1.0, "end": 2.0}]},
+    {"start": 2.0, "end": 4.0, "text": " How are you?",
+     "words": [{"word": " How", "start": 2.1, "end": 2.5}, {"word": " are", "start": 2.6, "end": 3.0},
+               {"word": " you?", "start": 3.1, "end": 4.0}]},
+]
+
+
+def test_event_spanning_segments():
+    df = align_events([("Block", 1.5, 2.7)], SEGMENTS)
+    assert list(df.columns) == ALIGNMENT_COLUMNS
+    row = df.iloc[0]
+    assert row.segment_ids == [0, 1]
+    assert row.text == "Hello there. How are you?"
+    assert row.words == "there. How are"
+    assert row.overlap_s == pytest.approx(1.2)
+
+
+def test_event_without_words_falls_back_to_empty():
+    segments = [{k: v for k, v in seg.items() if k != "words"} for seg in SEGMENTS]
+    row = align_events([("Prolongation", 3.0, 3.5)], segments).iloc[0]
+    assert row.segment_ids == [1]
+    assert row.words == ""
+
+
+def test_event_in_silence():
+    row = align_events([("Interjection", 10.0, 11.0)], SEGMENTS).iloc[0]
+    assert row.segment_ids == [] and row.text == "" and row.overlap_s == 0
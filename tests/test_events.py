@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import random_probs
+from pipeline.events import TYPE_NAMES, FRAME_DURATION, group_stutter_events, extract_events, summarize_events
+
+
+def reference_runs(probs, thresholds, frame_duration=FRAME_DURATION, min_duration=0.0, merge_gap=0.0):
+    """Per-frame loop: (type index, on frame, off frame) after merging and min-duration filtering."""
+    runs = []
+    for t in range(probs.shape[1]):
+        spans, start = [], None
+        for i, p in enumerate(probs[:, t]):
+            if p > thresholds[t] and start is None:
+                start = i
+            elif p <= thresholds[t] and start is not None:
+                spans.append([start, i])
+                start = None
+        if start is not None:
+            spans.append([start, probs.shape[0]])
+
+        merged = []
+        for on, off in spans:
+            if merged and merge_gap > 0 and on - merged[-1][1] <= merge_gap / frame_duration:
+                merged[-1][1] = off
+            else:
+                merged.append([on, off])
+        runs += [(t, on, off) for on, off in merged if min_duration <= 0 or (off - on) * frame_duration >= min_duration]
+    return runs
+
+
+def as_runs(events, frame_duration=FRAME_DURATION):
+    return [(int(e["type"]), int(round(e["start"] / frame_duration)), int(round(e["end"] / frame_duration)))
+            for e in events]
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+def test_matches_group_stutter_events(rng):
+    for _ in range(200):
+        probs = random_probs(rng, int(rng.integers(1, 500)))
+        expected_events, expected_counts = group_stutter_events(probs)
+        events, counts = summarize_events(extract_events(probs))
+        assert counts == expected_counts
+        assert len(events) == len(expected_events)
+        for (a_type, a_start, a_end), (e_type, e_start, e_end) in zip(events, expected_events):
+            assert a_type == e_type
+            assert a_start == pytest.approx(e_start)
+            assert a_end == pytest.approx(e_end)
+
+
+def test_batch_equals_single_sequences(rng):
+    batch = np.stack([random_probs(rng, 300) for _ in range(8)])
+    events = extract_events(batch)
+    for i, probs in enumerate(batch):
+        single = extract_events(probs)
+        assert np.array_equal(events[events["seq"] == i][["type", "start", "end", "peak"]],
+                              single[["type", "start", "end", "peak"]])
+
+
+@pytest.mark.parametrize("merge_gap", [0.05, 0.1, 0.3])
+def test_merge_gap(rng, merge_gap):
+    for _ in range(50):
+        probs = random_probs(rng, int(rng.integers(1, 500)))
+        expected = reference_runs(probs, [0.5] * len(TYPE_NAMES), merge_gap=merge_gap)
+        assert as_runs(extract_events(probs, merge_gap=merge_gap)) == expected
+
+
+def test_merge_gap_joins_close_runs():
+    probs = np.zeros((20, len(TYPE_NAMES)))
+    probs[2:5, 0] = probs[7:10, 0] = 0.9  # two frames apart
+    assert len(extract_events(probs)) == 2
+    merged = extract_events(probs, merge_gap=2 * FRAME_DURATION)
+    assert as_runs(merged) == [(0, 2, 10)]
+
+
+@pytest.mark.parametrize("min_duration", [0.05, 0.1, 0.25])
+def test_min_duration(rng, min_duration):
+    for _ in range(50):
+        probs = random_probs(rng, int(rng.integers(1, 500)))
+        expected = reference_runs(probs, [0.5] * len(TYPE_NAMES), min_duration=min_duration)
+        assert as_runs(extract_events(probs, min_duration=min_duration)) == expected
+
+
+def test_merge_before_min_duration():
+    probs = np.zeros((20, len(TYPE_NAMES)))
+    probs[2:3, 1] = probs[4:5, 1] = 0.9  # two 1-frame blips, one frame apart
+    assert len(extract_events(probs, min_duration=2 * FRAME_DURATION)) == 0
+    events = extract_events(probs, min_duration=2 * FRAME_DURATION, merge_gap=FRAME_DURATION)
+    assert as_runs(events) == [(1, 2, 5)]
+
+
+def test_per_class_thresholds(rng):
+    thresholds = np.array([0.3, 0.5, 0.7, 0.4, 0.6])
+    for _ in range(50):
+        probs = random_probs(rng, int(rng.integers(1, 500)))
+        assert as_runs(extract_events(probs, threshold=thresholds)) == reference_runs(probs, thresholds)
+
+
+def test_peak_is_max_probability_in_run():
+    probs = np.zeros((10, len(TYPE_NAMES)))
+    probs[3:6, 2] = [0.6, 0.95, 0.7]
+    events = extract_events(probs)
+    assert len(events) == 1
+    assert events["peak"][0] == pytest.approx(0.95)
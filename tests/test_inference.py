@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from model import WINDOW_SIZE, HOP_SIZE
+from pipeline.events import TYPE_NAMES
+from pipeline.inference import frame_windows, merge_windows
+
+
+def features(n_frames, seed=0):
+    return np.random.default_rng(seed).standard_normal((3, 64, n_frames)).astype(np.float32)
+
+
+def window_probs(starts, fn):
+    """Per-window seq probabilities that are a function of the absolute frame index."""
+    frames = np.asarray(starts)[:, None] + np.arange(WINDOW_SIZE)
+    return np.repeat(fn(frames)[..., None], len(TYPE_NAMES), axis=2).astype(np.float32)
+
+
+@pytest.mark.parametrize("n_frames", [64, 65, 80, 200, 1000])
+def test_window_count_and_tail_coverage(n_frames):
+    windows, starts = frame_windows(features(n_frames))
+    expected = len(range(0, n_frames - WINDOW_SIZE + 1, HOP_SIZE))
+    if (n_frames - WINDOW_SIZE) % HOP_SIZE:
+        expected += 1  # extra window flush with the end
+    assert windows.shape == (expected, 3, 64, WINDOW_SIZE)
+    assert starts[0] == 0 and starts[-1] == n_frames - WINDOW_SIZE
+    covered = np.zeros(n_frames, dtype=bool)
+    for s in starts:
+        covered[s:s + WINDOW_SIZE] = True
+    assert covered.all()
+
+
+def test_windows_are_normalized_per_channel():
+    windows, _ = frame_windows(features(300))
+    assert np.allclose(windows.mean(axis=(2, 3)), 0, atol=1e-5)
+    assert np.allclose(windows.std(axis=(2, 3)), 1, atol=1e-4)
+
+
+def test_flat_input_does_not_divide_by_zero():
+    with np.errstate(invalid="raise", divide="raise"):
+        windows, _ = frame_windows(np.ones((3, 64, 100), dtype=np.float32))
+    assert (windows == 0).all()
+
+
+@pytest.mark.parametrize("n_frames", [64, 100, 200, 777])
+def test_merge_recovers_frame_function(n_frames):
+    # Overlapping windows that agree on every frame average back to the same timeline
+    _, starts = frame_windows(features(n_frames))
+    fn = lambda t: (np.sin(t / 7.0) + 1) / 2
+    timeline = merge_windows(window_probs(starts, fn), starts, n_frames)
+    assert timeline.shape == (n_frames, len(TYPE_NAMES))
+    assert np.allclose(timeline[:, 0], fn(np.arange(n_frames)), atol=1e-6)
+
+
+def test_merge_averages_overlaps():
+    starts = np.array([0, 16])
+    probs = np.stack([np.zeros((WINDOW_SIZE, 5)), np.ones((WINDOW_SIZE, 5))]).astype(np.float32)
+    timeline = merge_windows(probs, starts, 80)
+    assert np.allclose(timeline[:16], 0)
+    assert np.allclose(timeline[16:64], 0.5)
+    assert np.allclose(timeline[64:], 1)
+
+
+def test_sub_window_clip():
+    n_frames = 30
+    windows, starts = frame_windows(features(n_frames))
+    assert windows.shape == (1, 3, 64, WINDOW_SIZE)
+    assert list(starts) == [0]
+    # The padding is part of the model input but not of the returned timeline
+    probs = window_probs(starts, lambda t: t / 100.0)
+    timeline = merge_windows(probs, starts, n_frames)
+    assert timeline.shape == (n_frames, len(TYPE_NAMES))
+    assert np.allclose(timeline[:, 0], np.arange(n_frames) / 100.0)
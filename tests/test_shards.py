@@ -0,0 +1,68 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from model import WINDOW_SIZE
+from pipeline.events import TYPE_NAMES
+from pipeline.frames import FRAME_DURATION
+from pipeline.shards import INDEX_FILE, ShardWriter, frame_labels, split_dataset
+
+N_MELS = 4
+
+
+def build_store(root, windows_per_recording, shard_size=16):
+    writer = ShardWriter(str(root), n_mels=N_MELS, shard_size=shard_size)
+    for r, n in enumerate(windows_per_recording):
+        # Every window carries its recording number, so a split can be traced back
+        windows = np.full((n, 3, N_MELS, WINDOW_SIZE), r, dtype=np.float32)
+        writer.add(windows, np.zeros(n, np.float32), np.zeros((n, WINDOW_SIZE, len(TYPE_NAMES)), np.uint8),
+                   recording_id=f"rec{r}.wav")
+    writer.close()
+    return str(root)
+
+
+def recordings_in(dataset):
+    return {int(dataset[i][0][0, 0, 0]) for i in range(len(dataset))}
+
+
+def test_index_records_recording_ranges(tmp_path):
+    root = build_store(tmp_path, [5, 20, 3])
+    with open(os.path.join(root, INDEX_FILE)) as f:
+        index = json.load(f)
+    assert index["recordings"] == [["rec0.wav", 0, 5], ["rec1.wav", 5, 20], ["rec2.wav", 25, 3]]
+    assert index["shards"] == [16, 12]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_split_keeps_recordings_whole(tmp_path, seed):
+    sizes = np.random.default_rng(seed).integers(1, 30, 25).tolist()
+    root = build_store(tmp_path, sizes)
+    train, valid = split_dataset(root, valid_pct=0.2, seed=seed)
+
+    assert len(train) + len(valid) == sum(sizes)
+    train_recs, valid_recs = recordings_in(train), recordings_in(valid)
+    assert not train_recs & valid_recs
+    assert train_recs | valid_recs == set(range(len(sizes)))
+    # Whole recordings on each side, and valid close to the requested share
+    assert len(valid) == sum(sizes[r] for r in valid_recs)
+    assert abs(len(valid) / sum(sizes) - 0.2) <= max(sizes) / sum(sizes)
+
+
+def test_split_requires_recording_index(tmp_path):
+    root = build_store(tmp_path, [4, 4])
+    path = os.path.join(root, INDEX_FILE)
+    with open(path) as f:
+        index = json.load(f)
+    del index["recordings"]
+    with open(path, "w") as f:
+        json.dump(index, f)
+    with pytest.raises(ValueError):
+        split_dataset(root)
+
+
+def test_frame_labels_use_hop_time_base():
+    labels = frame_labels([{"type": "Block", "start": 10 * FRAME_DURATION, "end": 20 * FRAME_DURATION}], 50)
+    block = labels[:, TYPE_NAMES.index("Block")]
+    assert block[10:20].all() and block.sum() == 10
@@ -0,0 +1,16 @@
+import numpy as np
+import torch
+
+from model import CNN_BiGRU_StutterTiming, WINDOW_SIZE
+from pipeline.streaming import StreamingDetector
+
+
+def test_digital_silence_gives_finite_features():
+    torch.manual_seed(0)
+    model = CNN_BiGRU_StutterTiming(sample_shape=(3, 64, WINDOW_SIZE)).eval()
+    detector = StreamingDetector(model)
+    with np.errstate(invalid="raise", divide="raise"):
+        detector.push(np.zeros(48000, dtype=np.float32))
+        features = detector._window_features()
+    assert torch.isfinite(features).all()
+    assert (features == 0).all()
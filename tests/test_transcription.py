@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from pipeline.transcription import FRAME_SECONDS, split_at_silence, stitch
+
+SR = 1000
+
+
+def speech_with_gaps(seconds, gaps):
+    """Constant-level 'speech' with near-silent gaps at the given [start, end) seconds."""
+    y = np.full(int(seconds * SR), 0.5, dtype=np.float32)
+    for start, end in gaps:
+        y[int(start * SR):int(end * SR)] = 0.001
+    return y
+
+
+def test_short_recording_is_one_chunk():
+    y = speech_with_gaps(15, [])
+    assert split_at_silence(y, SR, chunk_seconds=10, search_seconds=2) == [(0, len(y))]
+
+
+def test_chunks_tile_the_signal():
+    y = speech_with_gaps(95, [])
+    chunks = split_at_silence(y, SR, chunk_seconds=10, search_seconds=2)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(y)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    # No chunk is much shorter or longer than chunk_seconds (the last one absorbs the remainder)
+    lengths = [(end - start) / SR for start, end in chunks]
+    assert all(8 - FRAME_SECONDS <= n <= 12 + FRAME_SECONDS for n in lengths[:-1])
+    assert lengths[-1] < 10 * 1.5 + 2
+
+
+def test_cuts_land_in_silence_near_the_target():
+    gaps = [(10.6, 11.0), (21.2, 21.6), (30.5, 30.9)]
+    y = speech_with_gaps(40, gaps)
+    chunks = split_at_silence(y, SR, chunk_seconds=10, search_seconds=2)
+    cuts = [start / SR for start, _ in chunks[1:]]
+    assert len(cuts) == 3
+    for cut, (gap_start, gap_end) in zip(cuts, gaps):
+        assert gap_start <= cut < gap_end
+
+
+def test_stitch_offsets_segments_and_words():
+    results = [
+        {"text": " One.", "segments": [{"id": 0, "seek": 0, "start": 0.0, "end": 1.0, "text": " One.",
+                                        "words": [{"word": " One.", "start": 0.2, "end": 0.9}]}]},
+        {"text": " Two.", "segments": [{"id": 0, "seek": 0, "start": 0.5, "end": 2.0, "text": " Two.",
+                                        "words": [{"word": " Two.", "start": 0.5, "end": 1.5}]}]},
+    ]
+    text, segments = stitch(results, [0.0, 30.0])
+    assert text == " One. Two."
+    assert [seg["id"] for seg in segments] == [0, 1]
+    assert (segments[1]["start"], segments[1]["end"]) == pytest.approx((30.5, 32.0))
+    assert segments[1]["seek"] == 3000
+    assert (segments[1]["words"][0]["start"], segments[1]["words"][0]["end"]) == pytest.approx((30.5, 31.5))
+    # Inputs are not modified
+    assert results[1]["segments"][0]["start"] == 0.5
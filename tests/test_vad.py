@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from pipeline.events import count_types
+from pipeline.vad import PAD_MS, VoicedMap, apply_vad
+
+SR = 100
+# Voiced [1, 2) s and [5, 7) s of a 10 s recording → compacted [0, 1) and [1, 3)
+REGIONS = [[100, 200], [500, 700]]
+
+
+@pytest.fixture
+def voiced_map():
+    return VoicedMap(REGIONS, 1000, sr=SR)
+
+
+def test_to_original_inside_regions(voiced_map):
+    assert voiced_map.to_original(0.5) == pytest.approx(1.5)
+    assert voiced_map.to_original(2.0) == pytest.approx(6.0)
+
+
+def test_splice_point_depends_on_side(voiced_map):
+    # A start on the splice belongs to the next region, an end to the previous one
+    assert voiced_map.to_original(1.0) == pytest.approx(5.0)
+    assert voiced_map.to_original(1.0, end=True) == pytest.approx(2.0)
+
+
+def test_event_within_one_region(voiced_map):
+    assert voiced_map.remap_events([("Block", 1.2, 1.8)]) == [("Block", pytest.approx(5.2), pytest.approx(5.8))]
+
+
+def test_event_ending_on_splice_is_not_stretched(voiced_map):
+    assert voiced_map.remap_events([("Block", 0.5, 1.0)]) == [("Block", pytest.approx(1.5), pytest.approx(2.0))]
+
+
+def test_event_across_splice_is_split(voiced_map):
+    assert voiced_map.remap_events([("Prolongation", 0.8, 1.4)]) == [
+        ("Prolongation", pytest.approx(1.8), pytest.approx(2.0)),
+        ("Prolongation", pytest.approx(5.0), pytest.approx(5.4)),
+    ]
+
+
+def test_segment_end_on_splice(voiced_map):
+    seg = {"start": 0.2, "end": 1.0, "words": [{"word": " so", "start": 0.6, "end": 1.0}]}
+    (remapped,) = voiced_map.remap_segments([seg])
+    assert remapped["end"] == pytest.approx(2.0)
+    assert remapped["words"][0]["end"] == pytest.approx(2.0)
+
+
+def speech_with_pause(pause_seconds, sr=16000):
+    rng = np.random.default_rng(0)
+    tone = 0.3 * np.sin(2 * np.pi * 180 * np.arange(sr) / sr)
+    silence = 0.001 * rng.standard_normal(int(pause_seconds * sr))
+    return np.concatenate([tone, silence, tone, silence, tone]).astype(np.float32)
+
+
+def test_block_length_pause_survives_vad():
+    y = speech_with_pause(1.5)
+    voiced, voiced_map = apply_vad(y)
+    assert len(voiced) == len(y)
+    assert voiced_map.skipped_fraction == 0
+
+
+def test_long_pause_is_shortened():
+    y = speech_with_pause(5.0)
+    voiced, voiced_map = apply_vad(y)
+    skipped_seconds = (len(y) - len(voiced)) / 16000
+    assert skipped_seconds == pytest.approx(2 * (5.0 - 2 * PAD_MS / 1000), abs=0.1)
+
+
+def test_counts_follow_split_events(voiced_map):
+    events = voiced_map.remap_events([("Prolongation", 0.8, 1.4), ("Block", 1.2, 1.8)])
+    counts = count_types(events)
+    assert counts["Prolongation"] == 2 and counts["Block"] == 1
+    assert sum(counts.values()) == len(events)
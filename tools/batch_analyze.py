@@ -0,0 +1,209 @@
+"""Offline stutter analysis for a directory (or manifest) of recordings.
+
+    python -m tools.batch_analyze recordings/ -o results.csv --workers 4
+
+Decoding and full-length feature extraction run in a process pool, with at
+most 2 x workers files in flight so fast decoders cannot run ahead of the model.
+Workers return compact (3, n_mels, T) features; the consumer cuts each
+recording into WINDOW_SIZE windows as it feeds them to CNN_BiGRU_StutterTiming,
+sharing forward passes across files, then overlap-averages them back into one
+timeline per file. Files already in the output are skipped, so an
+interrupted run can simply be restarted. A .parquet output is a directory with
+one part file per flush.
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import librosa
+import numpy as np
+import pandas as pd
+import torch
+
+from model import BS
+from pipeline.inference import load_full_features, frame_windows, merge_windows
+from pipeline.backends import load_backend, BACKENDS
+from pipeline.frontend import TorchFeatureFrontend, pad_waveforms
+from pipeline.frames import SAMPLE_RATE
+from pipeline.events import TYPE_NAMES, extract_events, summarize_events
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".flac", ".ogg")
+
+
+def list_inputs(source):
+    if os.path.isdir(source):
+        files = []
+        for root, _, names in os.walk(source):
+            files.extend(os.path.join(root, n) for n in names if n.lower().endswith(AUDIO_EXTENSIONS))
+        return sorted(files)
+    # Manifest: one path per line, relative paths resolved against the manifest
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    return [line if os.path.isabs(line) else os.path.join(base, line) for line in lines]
+
+
+def read_done(output):
+    if not os.path.exists(output):
+        return set()
+    df = pd.read_parquet(output) if output.endswith(".parquet") else pd.read_csv(output)
+    return set(df["file"])
+
+
+def append_rows(output, rows):
+    df = pd.DataFrame(rows)
+    if output.endswith(".parquet"):
+        # New part file per flush: earlier parts are never re-read or rewritten
+        os.makedirs(output, exist_ok=True)
+        df.to_parquet(os.path.join(output, f"part-{time.time_ns()}.parquet"), index=False)
+    else:
+        df.to_csv(output, mode="a", header=not os.path.exists(output), index=False)
+
+
+def featurize(path):
+    try:
+        return path, load_full_features(path), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def decode_only(path):
+    try:
+        y, _ = librosa.load(path, sr=SAMPLE_RATE)
+        return path, y, None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def map_bounded(pool, fn, items, max_in_flight):
+    """pool.map in submission order, but with at most max_in_flight tasks submitted at once."""
+    items = iter(items)
+    in_flight = deque(pool.submit(fn, item) for item in itertools.islice(items, max_in_flight))
+    while in_flight:
+        result = in_flight.popleft().result()
+        in_flight.extend(pool.submit(fn, item) for item in itertools.islice(items, 1))
+        yield result
+
+
+def waveform_features(frontend, waveforms):
+    """Full-length (3, n_mels, T) features for a group of waveforms in one torch pass."""
+    with torch.no_grad():
+        features, n_frames = frontend(*pad_waveforms(waveforms))
+    return [x[..., :n] for x, n in zip(features.numpy(), n_frames.tolist())]
+
+
+def error_row(path, error):
+    row = {"file": path, "bin_prob": float("nan"), "error": error, "events": "[]"}
+    row.update(dict.fromkeys(TYPE_NAMES, 0))
+    return row
+
+
+def run_batch(model, items, batch_size=BS):
+    """items: (path, (3, n_mels, T) features) → one result row per file.
+
+    Windows are cut one file at a time and run batch_size at a time; a partial
+    batch at the end of a file is topped up from the next one, so short
+    recordings share forward passes. Only one file's windows are held at once.
+    """
+    bin_probs, seq_probs, framed = [], [], []
+
+    def forward(windows):
+        bin_pred, seq_pred = model(torch.from_numpy(windows))
+        bin_probs.append(torch.sigmoid(bin_pred).squeeze(1).numpy())
+        seq_probs.append(torch.sigmoid(seq_pred).numpy())
+
+    carry = None
+    with torch.no_grad():
+        for path, features in items:
+            windows, starts = frame_windows(features)
+            framed.append((path, len(windows), starts, features.shape[-1]))
+            if carry is not None:
+                k = batch_size - len(carry)
+                carry, windows = np.concatenate([carry, windows[:k]]), windows[k:]
+                if len(carry) < batch_size:
+                    continue
+                forward(carry)
+            n_full = len(windows) // batch_size * batch_size
+            for i in range(0, n_full, batch_size):
+                forward(windows[i:i + batch_size])
+            carry = windows[n_full:].copy() if n_full < len(windows) else None
+        if carry is not None:
+            forward(carry)
+    bin_probs, seq_probs = np.concatenate(bin_probs), np.concatenate(seq_probs)
+
+    rows, offset = [], 0
+    for path, n, starts, n_frames in framed:
+        timeline = merge_windows(seq_probs[offset:offset + n], starts, n_frames)
+        events, type_counts = summarize_events(extract_events(timeline))
+        row = {"file": path, "bin_prob": float(bin_probs[offset:offset + n].max()), "error": "",
+               "events": json.dumps([{"type": t, "start": s, "end": e} for t, s, e in events])}
+        row.update(type_counts)
+        rows.append(row)
+        offset += n
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="directory of recordings or a manifest file with one path per line")
+    parser.add_argument("-o", "--output", default="batch_results.csv", help=".csv or .parquet")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="inference engine (default: $INFERENCE_BACKEND or torch)")
+    parser.add_argument("--model", default=None, help="weights / exported artifact for the backend")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch-size", type=int, default=BS, help="windows per forward pass")
+    parser.add_argument("--files-per-flush", type=int, default=32, help="files per result write")
+    parser.add_argument("--torch-frontend", action="store_true",
+                        help="workers only decode; mel/delta features are computed batched in torch")
+    args = parser.parse_args(argv)
+
+    done = read_done(args.output)
+    files = [f for f in list_inputs(args.source) if f not in done]
+    print(f"{len(files)} files to analyze ({len(done)} already in {args.output})")
+    if not files:
+        return
+
+    model = load_backend(args.backend, args.model)
+    frontend = TorchFeatureFrontend(max_len=None) if args.torch_frontend else None
+    worker = decode_only if args.torch_frontend else featurize
+    start = time.perf_counter()
+    processed = 0
+    pending, failed = [], []
+
+    def flush():
+        nonlocal processed
+        rows = list(failed)
+        if pending:
+            paths, inputs = zip(*pending)
+            if frontend is not None:
+                # Waveforms in: feature extraction runs batched in torch before the windows are cut
+                inputs = waveform_features(frontend, inputs)
+            rows += run_batch(model, zip(paths, inputs), args.batch_size)
+        append_rows(args.output, rows)
+        processed += len(rows)
+        pending.clear()
+        failed.clear()
+        elapsed = time.perf_counter() - start
+        print(f"{processed}/{len(files)} files  {processed / elapsed:.2f} files/sec")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for path, x, error in map_bounded(pool, worker, files, 2 * args.workers):
+            if error is not None:
+                failed.append(error_row(path, error))
+            else:
+                pending.append((path, x))
+            if len(pending) + len(failed) >= args.files_per_flush:
+                flush()
+        if pending or failed:
+            flush()
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {processed} files in {elapsed:.1f}s ({processed / elapsed:.2f} files/sec)")
+
+
+if __name__ == "__main__":
+    main()
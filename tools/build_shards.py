@@ -0,0 +1,59 @@
+"""Precompute training windows into memory-mapped shards.
+
+    python -m tools.build_shards labels.csv data/shards --workers 8
+
+labels.csv has a ``file`` column and an ``events`` column holding a JSON list
+of {"type", "start", "end"} intervals in seconds (the format tools.batch_analyze
+writes). An optional ``stutter`` column gives the file-level label used for
+windows when ``events`` is empty.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from pipeline.inference import load_full_features, frame_windows
+from pipeline.shards import ShardWriter, frame_labels, window_labels, SHARD_SIZE
+
+
+def featurize(path):
+    features = load_full_features(path)
+    windows, starts = frame_windows(features)
+    return windows, starts, features.shape[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("labels")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    args = parser.parse_args(argv)
+
+    labels = pd.read_csv(args.labels)
+    base = os.path.dirname(os.path.abspath(args.labels))
+    paths = [p if os.path.isabs(p) else os.path.join(base, p) for p in labels["file"]]
+
+    writer = ShardWriter(args.output, shard_size=args.shard_size)
+    start = time.perf_counter()
+    total = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for (_, row), (windows, starts, n_frames) in zip(labels.iterrows(), pool.map(featurize, paths, chunksize=4)):
+            events = json.loads(row["events"]) if isinstance(row.get("events"), str) else []
+            seq, bins = window_labels(frame_labels(events, n_frames), starts)
+            if not events and "stutter" in row:
+                bins[:] = float(row["stutter"])
+            writer.add(windows, bins, seq, recording_id=row["file"])
+            total += len(windows)
+    writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {total} windows from {len(paths)} files into {len(writer.counts)} shards "
+          f"in {elapsed:.1f}s → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
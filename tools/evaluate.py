@@ -0,0 +1,138 @@
+"""Evaluate CNN_BiGRU_StutterTiming on held-out windows and write model_metrics.json.
+
+    python -m tools.evaluate data/shards --split valid -o model_metrics.json
+
+Windows come from a shard store (tools.build_shards). All metrics are
+computed from confusion counts accumulated batch by batch with tensor ops;
+the output uses exactly the keys role_pages/admin_models reads, plus
+"Evaluation Throughput" and "Evaluation Split" entries. The valid split holds
+out whole recordings (pipeline.shards.split_dataset), so no overlapping window
+of a held-out recording was seen in training.
+"""
+import argparse
+import json
+import os
+import time
+
+import torch
+
+from model import BS, stutter_loss
+from pipeline.backends import load_backend, BACKENDS
+from pipeline.events import TYPE_NAMES, THRESHOLD
+from pipeline.shards import INDEX_FILE, ShardedWindowDataset, split_dataset, make_torch_loader
+
+
+def f1_from_counts(tp, fp, fn):
+    precision = tp / (tp + fp).clamp(min=1)
+    recall = tp / (tp + fn).clamp(min=1)
+    f1 = 2 * precision * recall / (precision + recall).clamp(min=1e-12)
+    return precision, recall, f1
+
+
+def evaluate(model, loader, threshold=THRESHOLD):
+    n_types = len(TYPE_NAMES)
+    bin_counts = torch.zeros(4, dtype=torch.float64)        # tp, fp, fn, tn
+    seq_counts = torch.zeros(3, n_types, dtype=torch.float64)  # tp, fp, fn per type
+    losses = []
+    n_windows = 0
+
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        for x, bin_y, seq_y in loader:
+            bin_out, seq_out = model(x)
+            losses.append(stutter_loss((bin_out, seq_out), bin_y, seq_y).item())
+            n_windows += len(x)
+
+            bin_pred = torch.sigmoid(bin_out) > threshold
+            bin_true = bin_y > 0.5
+            bin_counts += torch.stack([
+                (bin_pred & bin_true).sum(), (bin_pred & ~bin_true).sum(),
+                (~bin_pred & bin_true).sum(), (~bin_pred & ~bin_true).sum(),
+            ]).double()
+
+            seq_pred = torch.sigmoid(seq_out) > threshold
+            seq_true = seq_y > 0.5
+            seq_counts += torch.stack([
+                (seq_pred & seq_true).sum(dim=(0, 1)),
+                (seq_pred & ~seq_true).sum(dim=(0, 1)),
+                (~seq_pred & seq_true).sum(dim=(0, 1)),
+            ]).double()
+    elapsed = time.perf_counter() - t0
+
+    tp, fp, fn, tn = bin_counts
+    bin_precision, bin_recall, bin_f1 = f1_from_counts(tp, fp, fn)
+    _, _, class_f1 = f1_from_counts(*seq_counts)
+    _, _, seq_f1 = f1_from_counts(*seq_counts.sum(dim=1))  # micro-average over frames and types
+
+    return {
+        "Binary F1 Score": round(bin_f1.item(), 4),
+        "Binary Precision": round(bin_precision.item(), 4),
+        "Binary Recall": round(bin_recall.item(), 4),
+        "Binary Accuracy": round(((tp + tn) / bin_counts.sum().clamp(min=1)).item(), 4),
+        "Sequence F1 Score": round(seq_f1.item(), 4),
+        "Class-wise F1": {name: round(v, 4) for name, v in zip(TYPE_NAMES, class_f1.tolist())},
+        "Loss Curve": [round(v, 5) for v in losses],
+        "Evaluation Throughput": {
+            "windows": n_windows,
+            "seconds": round(elapsed, 3),
+            "windows_per_sec": round(n_windows / elapsed, 1) if elapsed > 0 else None,
+        },
+    }
+
+
+def describe_split(dataset, split, valid_pct, seed):
+    with open(os.path.join(dataset.root, INDEX_FILE)) as f:
+        recordings = json.load(f).get("recordings", [])
+    included = set(dataset.indices.tolist())
+    split_info = {
+        "split": split,
+        "split_by": "recording",
+        "recordings": sum(1 for _, first, _ in recordings if first in included),
+        "windows": len(dataset),
+    }
+    if split == "valid":
+        split_info.update(valid_pct=valid_pct, seed=seed)
+    return split_info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("shards")
+    parser.add_argument("--split", choices=["valid", "all"], default="valid",
+                        help="'valid' = the recordings split_dataset holds out, 'all' = every window in the store")
+    parser.add_argument("--valid-pct", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42, help="split seed; must match the one used for training")
+    parser.add_argument("-o", "--output", default="model_metrics.json")
+    parser.add_argument("--epochs", type=int, default=None,
+                        help="training epochs to record (default: keep the value already in the output file)")
+    parser.add_argument("--batch-size", type=int, default=BS * 8)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backend", choices=BACKENDS, default=None)
+    parser.add_argument("--model", default=None)
+    args = parser.parse_args(argv)
+
+    if args.split == "valid":
+        _, dataset = split_dataset(args.shards, args.valid_pct, args.seed)
+    else:
+        dataset = ShardedWindowDataset(args.shards)
+    loader = make_torch_loader(dataset, bs=args.batch_size, shuffle=False, num_workers=args.workers)
+
+    metrics = evaluate(load_backend(args.backend, args.model), loader)
+    metrics["Evaluation Split"] = describe_split(dataset, args.split, args.valid_pct, args.seed)
+
+    epochs = args.epochs
+    if epochs is None and os.path.exists(args.output):
+        with open(args.output) as f:
+            epochs = json.load(f).get("Training Epochs")
+    if epochs is not None:
+        metrics["Training Epochs"] = epochs
+
+    with open(args.output, "w") as f:
+        json.dump(metrics, f, indent=2)
+    throughput = metrics["Evaluation Throughput"]
+    print(f"Evaluated {throughput['windows']} windows in {throughput['seconds']}s "
+          f"({throughput['windows_per_sec']} windows/s) → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
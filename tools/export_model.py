@@ -0,0 +1,108 @@
+"""Export CNN_BiGRU_StutterTiming to TorchScript and ONNX, check parity, compare speed.
+
+    python -m tools.export_model --weights stutter_model_full.pt
+
+Both artifacts take input (batch, 3, n_mels, time) with dynamic batch and
+time axes and return (bin_out, seq_out) like the eager module.
+"""
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from pipeline.inference import load_model, MODEL_PATH
+from pipeline.backends import (TorchScriptBackend, OnnxBackend, TORCHSCRIPT_PATH, ONNX_PATH,
+                               export_torchscript, export_onnx)
+from pipeline.frames import N_MELS
+
+PARITY_SHAPES = [(1, 64), (4, 128), (8, 311)]  # (batch, time)
+BENCH_BATCH_SIZES = [1, 8, 32, 64]
+BENCH_TIME = 64
+ATOL = 1e-4
+DYNAMIC_AXES = {"input": (0, 3), "bin_out": (0,), "seq_out": (0, 1)}  # batch, time
+
+
+def check_onnx_axes(path):
+    """The graph must declare symbolic batch/time dims, or onnxruntime warns on every non-64-frame call."""
+    import onnx
+
+    graph = onnx.load(path).graph
+    ok = True
+    for value in [*graph.input, *graph.output]:
+        axes = DYNAMIC_AXES.get(value.name)
+        if axes is None:
+            continue
+        dims = value.type.tensor_type.shape.dim
+        shape = [d.dim_param or d.dim_value for d in dims]
+        static = [axis for axis in axes if not dims[axis].dim_param]
+        ok &= not static
+        print(f"  {value.name:<8} {shape}  {'ok' if not static else f'STATIC axes {static}'}")
+    return ok
+
+
+def check_parity(reference, backends):
+    ok = True
+    torch.manual_seed(0)
+    for batch, n_frames in PARITY_SHAPES:
+        x = torch.randn(batch, 3, N_MELS, n_frames)
+        with torch.no_grad():
+            ref_bin, ref_seq = reference(x)
+            for name, backend in backends.items():
+                bin_out, seq_out = backend(x)
+                bin_err = (bin_out - ref_bin).abs().max().item()
+                seq_err = (seq_out - ref_seq).abs().max().item()
+                passed = bin_err <= ATOL and seq_err <= ATOL
+                ok &= passed
+                print(f"  {name:<11} B={batch:<3} T={n_frames:<4} bin_out err {bin_err:.2e}  "
+                      f"seq_out err {seq_err:.2e}  {'ok' if passed else 'MISMATCH'}")
+    return ok
+
+
+def benchmark(backends, repeat=20):
+    print(f"\n{'backend':<11} {'batch':>5} {'p50 ms':>9} {'windows/s':>10}")
+    with torch.no_grad():
+        for batch in BENCH_BATCH_SIZES:
+            x = torch.randn(batch, 3, N_MELS, BENCH_TIME)
+            for name, backend in backends.items():
+                backend(x)  # warm-up
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    backend(x)
+                    times.append(time.perf_counter() - t0)
+                p50 = float(np.median(times))
+                print(f"{name:<11} {batch:>5} {p50 * 1e3:>9.2f} {batch / p50:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weights", default=MODEL_PATH)
+    parser.add_argument("--torchscript", default=TORCHSCRIPT_PATH)
+    parser.add_argument("--onnx", default=ONNX_PATH)
+    parser.add_argument("--skip-bench", action="store_true")
+    args = parser.parse_args(argv)
+
+    model = load_model(args.weights)
+    export_torchscript(model, args.torchscript)
+    print(f"Saved TorchScript module to {args.torchscript}")
+    export_onnx(model, args.onnx)
+    print(f"Saved ONNX model to {args.onnx}")
+    print("\nONNX graph shapes:")
+    if not check_onnx_axes(args.onnx):
+        raise SystemExit("Exported ONNX graph has static batch/time axes")
+
+    backends = {
+        "torchscript": TorchScriptBackend(args.torchscript),
+        "onnx": OnnxBackend(args.onnx),
+    }
+    print("\nParity against eager PyTorch:")
+    if not check_parity(model, backends):
+        raise SystemExit("Exported model outputs differ from the eager module")
+
+    if not args.skip_bench:
+        benchmark({"torch": model, **backends})
+
+
+if __name__ == "__main__":
+    main()